@@ -2,30 +2,46 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import contextvars
+import http.client
+import itertools
 import json
 import logging
 import os
-import queue
 import re
 import shutil
+import sqlite3
+import ssl
 import subprocess
 import threading
 import time
-import urllib.error
+import urllib.parse
 import urllib.request
-from dataclasses import dataclass
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
 import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any, Iterable, Mapping
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, Mapping
 
+import httpx
 import yaml
 from dotenv import load_dotenv
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
 from pydantic import BaseModel, Field
 
 
 LOGGER = logging.getLogger("mcp-to-skills")
 LOCK_FILENAME = "mcp_settings.lock"
+DEFAULT_RESULT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_IDLE_TIMEOUT_SECONDS = 0
+LATENCY_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOOLS_CACHE_FILENAME = "mcp_tools_cache.json"
+DEFAULT_TOOLS_CACHE_TTL_SECONDS = 24 * 60 * 60
 
 
 class ServerConfig(BaseModel):
@@ -37,6 +53,24 @@ class ServerConfig(BaseModel):
     type: str | None = None
     transport: str | None = None
     headers: dict[str, str] = Field(default_factory=dict)
+    connection_pool_size: int = Field(default=4, ge=1)
+    discovery_timeout_seconds: float = Field(default=120, gt=0)
+    # Pre-started stdio processes kept ready to replace a crashed server.
+    warm_spares: int = Field(default=0, ge=0)
+    # Number of stdio processes requests are load-balanced across.
+    pool_size: int = Field(default=1, ge=1)
+    # Seconds to wait for a response before cancelling the call upstream; tool_timeouts
+    # overrides it for slow tools, e.g. {"browser_navigate": 120}.
+    request_timeout_seconds: float = Field(default=30, gt=0)
+    tool_timeouts: dict[str, float] = Field(default_factory=dict)
+    # Stop the server's processes after this long without calls (0 keeps it running,
+    # unset uses the bridge-wide --idle-timeout).
+    idle_timeout_seconds: float | None = Field(default=None, ge=0)
+    # Tool name -> seconds a successful result may be served from the bridge result cache.
+    cacheable_tools: dict[str, float] = Field(default_factory=dict)
+    # Coalesce concurrent identical requests into one upstream call: true for every call,
+    # false for none; unset only for cacheable_tools and READ_ONLY_METHODS.
+    single_flight: bool | None = None
     disabled: bool = False
     enabled: bool | None = None
 
@@ -52,7 +86,179 @@ class MCPError(RuntimeError):
     pass
 
 
+class MCPTimeoutError(MCPError):
+    pass
+
+
+NotificationHandler = Callable[[dict[str, Any]], None]
+# Routing key for the current bridged call; pooled clients keep one key on one worker.
+SESSION_KEY: contextvars.ContextVar[str | None] = contextvars.ContextVar("session_key", default=None)
+# Called once per server when its tool discovery finishes: (server_id, tools, error).
+ServerSyncHandler = Callable[[str, list[ToolDef] | None, Exception | None], None]
+# Receives (progress, total, message) for the current bridged call.
+ProgressHandler = Callable[[float, float | None, str | None], None]
+# Per-call options set by the caller and read by the client that sends the call.
+CALL_TIMEOUT: contextvars.ContextVar[float | None] = contextvars.ContextVar("call_timeout", default=None)
+PROGRESS_HANDLER: contextvars.ContextVar[ProgressHandler | None] = contextvars.ContextVar(
+    "progress_handler", default=None
+)
+# Id of the bridged call being traced; its spans share one lane in the trace viewer.
+TRACE_CALL_ID: contextvars.ContextVar[int | None] = contextvars.ContextVar("trace_call_id", default=None)
+
+
+class Tracer:
+    """Writes timing spans as Chrome trace events, or one JSON object per line.
+
+    The ``chrome`` format is an unterminated JSON array, which chrome://tracing and
+    Perfetto load as-is, so spans are flushed as they finish. Spans of one bridged call
+    use its call id as ``tid``; spans outside a call use the thread id.
+    """
+
+    def __init__(self, path: Path, trace_format: str = "chrome") -> None:
+        if trace_format not in {"chrome", "jsonl"}:
+            raise ValueError(f"unknown trace format: {trace_format}")
+        self._format = trace_format
+        self._file = path.open("w", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._call_ids = itertools.count(1)
+        if trace_format == "chrome":
+            self._file.write("[\n")
+
+    def new_call_id(self) -> int:
+        return next(self._call_ids)
+
+    def record(self, name: str, start: float, end: float, args: Mapping[str, Any] | None = None) -> None:
+        """Record a finished span; ``start`` and ``end`` are ``time.perf_counter()`` values."""
+        call_id = TRACE_CALL_ID.get()
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": round((start - self._origin) * 1_000_000, 1),
+            "dur": round((end - start) * 1_000_000, 1),
+            "pid": self._pid,
+            "tid": call_id if call_id is not None else threading.get_ident(),
+            "args": dict(args or {}),
+        }
+        line = json.dumps(event, ensure_ascii=True, default=str)
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + (",\n" if self._format == "chrome" else "\n"))
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+_TRACER: Tracer | None = None
+
+
+def set_tracer(tracer: Tracer | None) -> None:
+    global _TRACER
+    _TRACER = tracer
+
+
+@contextmanager
+def trace_span(name: str, **args: Any) -> Iterator[dict[str, Any]]:
+    """Time the block as a span when tracing is on; the yielded dict becomes the span's args."""
+    tracer = _TRACER
+    if tracer is None:
+        yield args
+        return
+    start = time.perf_counter()
+    try:
+        yield args
+    finally:
+        tracer.record(name, start, time.perf_counter(), args)
+
+
+@contextmanager
+def trace_call() -> Iterator[None]:
+    """Give the enclosed bridged call its own trace id (and viewer lane)."""
+    tracer = _TRACER
+    if tracer is None:
+        yield
+        return
+    token = TRACE_CALL_ID.set(tracer.new_call_id())
+    try:
+        yield
+    finally:
+        TRACE_CALL_ID.reset(token)
+
+
+class ProgressRouter:
+    """Routes upstream ``notifications/progress`` to the caller that asked for progress.
+
+    Tokens are unique across all clients, so every client can share one router.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._handlers: dict[str, ProgressHandler] = {}
+        self._tokens = itertools.count(1)
+
+    def attach(self, method: str, params: dict[str, Any] | None) -> tuple[dict[str, Any] | None, str | None]:
+        """Add a progress token to a ``tools/call`` if the current caller wants progress."""
+        handler = PROGRESS_HANDLER.get()
+        if handler is None or method != "tools/call":
+            return params, None
+        token = f"dev-swarm-{next(self._tokens)}"
+        params = dict(params or {})
+        params["_meta"] = {**(params.get("_meta") or {}), "progressToken": token}
+        with self._lock:
+            self._handlers[token] = handler
+        return params, token
+
+    def release(self, token: str | None) -> None:
+        if token is not None:
+            with self._lock:
+                self._handlers.pop(token, None)
+
+    def active(self) -> bool:
+        return bool(self._handlers)
+
+    def dispatch(self, message: dict[str, Any]) -> bool:
+        """Forward a progress notification; False if no caller is waiting for it."""
+        params = message.get("params") or {}
+        with self._lock:
+            handler = self._handlers.get(str(params.get("progressToken")))
+        if handler is None:
+            return False
+        try:
+            handler(params.get("progress", 0), params.get("total"), params.get("message"))
+        except Exception as exc:  # pragma: no cover - a broken caller must not stop the reader
+            LOGGER.warning(f"progress_forward_failed: {exc}")
+        return True
+
+
+PROGRESS = ProgressRouter()
+# Fire-and-forget tasks (e.g. cancel notifications) kept referenced until they finish.
+_background_tasks: set[asyncio.Future[Any]] = set()
+
+
 class MCPClient:
+    # Processes respawned after exiting; only supervised stdio clients restart.
+    restarts: int = 0
+
+    _notification_handler: NotificationHandler | None = None
+    _response_timeout_seconds = 30.0
+
+    def set_notification_handler(self, handler: NotificationHandler | None) -> None:
+        self._notification_handler = handler
+
+    def _call_timeout(self) -> float:
+        return CALL_TIMEOUT.get() or self._response_timeout_seconds
+
+    def _handle_notification(self, message: dict[str, Any]) -> None:
+        if message.get("method") == "notifications/progress" and PROGRESS.dispatch(message):
+            return
+        if self._notification_handler is not None:
+            self._notification_handler(message)
+            return
+        if message.get("method") == "notifications/progress":
+            LOGGER.debug("mcp-progress", extra={"params": message.get("params")})
+
     def list_tools(self) -> list[ToolDef]:
         raise NotImplementedError
 
@@ -62,48 +268,152 @@ class MCPClient:
     def request(self, method: str, params: dict[str, Any] | None) -> Any:
         raise NotImplementedError
 
+    async def request_async(self, method: str, params: dict[str, Any] | None) -> Any:
+        return await asyncio.to_thread(self.request, method, params)
+
+    async def call_tool_async(self, tool_name: str, arguments: dict[str, Any] | None) -> Any:
+        params = {"name": tool_name, "arguments": arguments or {}}
+        return await self.request_async("tools/call", params)
+
     def close(self) -> None:
         return None
 
+    async def aclose(self) -> None:
+        self.close()
+
+    def pids(self) -> list[int]:
+        """Local process ids backing this client; empty for remote servers."""
+        return []
+
+
+# How the official Python and TypeScript SDKs serialize notifications and server requests;
+# lines starting like this are never responses to our calls.
+_NOTIFICATION_PREFIXES = (b'{"jsonrpc":"2.0","method":', b'{"jsonrpc": "2.0", "method":', b'{"method":')
+
 
 class StdioClient(MCPClient):
-    _response_timeout_seconds = 30
+    """JSON-RPC client over a child process' stdin/stdout.
+
+    Requests are pipelined: each call registers a future keyed by its JSON-RPC id,
+    writes its payload and waits on the future, while a single reader thread routes
+    responses to the matching future. Many requests can be in flight at once.
 
-    def __init__(self, command: str, args: list[str], env: dict[str, str]) -> None:
+    Pipes are binary. The reader splits large buffered reads on newlines itself, so a
+    multi-megabyte response is joined once and decoded once, and log lines or unobserved
+    notifications are dropped without being decoded.
+    """
+
+    _read_chunk_bytes = 256 * 1024
+    # Seconds a terminated server gets to exit before it is killed.
+    _terminate_grace_seconds = 5.0
+
+    def __init__(
+        self, command: str, args: list[str], env: dict[str, str], response_timeout: float | None = None
+    ) -> None:
+        if response_timeout:
+            self._response_timeout_seconds = response_timeout
         self._next_id = 1
         self._lock = threading.Lock()
-        self._stdout_queue: queue.Queue[str] = queue.Queue()
+        self._write_lock = threading.Lock()
+        self._pending: dict[int, Future[Any]] = {}
         self._stdout_closed = threading.Event()
         merged_env = os.environ.copy()
         merged_env.update(env)
-        self._process = subprocess.Popen(
-            [command, *args],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            env=merged_env,
-        )
+        with trace_span("spawn", command=command):
+            self._process = subprocess.Popen(
+                [command, *args],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=merged_env,
+            )
         self._stderr_thread = threading.Thread(target=self._drain_stderr, daemon=True)
         self._stderr_thread.start()
         self._stdout_thread = threading.Thread(target=self._drain_stdout, daemon=True)
         self._stdout_thread.start()
-        self._initialize()
+        with trace_span("initialize"):
+            self._initialize()
 
     def _drain_stderr(self) -> None:
         if self._process.stderr is None:
             return
         for line in self._process.stderr:
-            LOGGER.debug("mcp-stderr", extra={"line": line.rstrip()})
+            LOGGER.debug("mcp-stderr", extra={"line": line.rstrip().decode("utf-8", "replace")})
 
     def _drain_stdout(self) -> None:
-        if self._process.stdout is None:
-            self._stdout_closed.set()
-            return
-        for line in self._process.stdout:
-            self._stdout_queue.put(line)
+        stdout = self._process.stdout
+        if stdout is not None:
+            # Pieces of a line that spans several reads; joined once when its newline arrives.
+            partial: list[bytes] = []
+            while chunk := stdout.read1(self._read_chunk_bytes):
+                start = 0
+                while (end := chunk.find(b"\n", start)) >= 0:
+                    if partial:
+                        partial.append(chunk[start:end])
+                        line = b"".join(partial)
+                        partial = []
+                    else:
+                        line = chunk[start:end]
+                    self._on_line(line)
+                    start = end + 1
+                if start < len(chunk):
+                    partial.append(chunk[start:] if start else chunk)
         self._stdout_closed.set()
+        self._fail_pending(MCPError("stdio process closed while awaiting response"))
+
+    def _on_line(self, line: bytes) -> None:
+        if _TRACER is None:
+            self._dispatch_line(line)
+            return
+        with trace_span("stdout_line", bytes=len(line)) as span:
+            span["kind"] = self._dispatch_line(line)
+
+    def _wants_notifications(self) -> bool:
+        return (
+            self._notification_handler is not None
+            or PROGRESS.active()
+            or LOGGER.isEnabledFor(logging.DEBUG)
+        )
+
+    def _dispatch_line(self, line: bytes) -> str:
+        """Route one stdout line; returns what it was (for tracing)."""
+        line = line.strip()
+        if not line.startswith(b"{"):
+            # Blank lines and servers logging to stdout.
+            return "skipped"
+        if line.startswith(_NOTIFICATION_PREFIXES) and not self._wants_notifications():
+            return "skipped"
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return "skipped"
+        if not isinstance(message, dict):
+            return "skipped"
+        if "method" in message:
+            if "id" not in message:
+                self._handle_notification(message)
+                return "notification"
+            return "skipped"
+        request_id = message.get("id")
+        if request_id is None:
+            return "skipped"
+        with self._lock:
+            future = self._pending.pop(request_id, None)
+        if future is None or future.done():
+            return "skipped"
+        if "error" in message:
+            future.set_exception(MCPError(message["error"]))
+        else:
+            future.set_result(message.get("result"))
+        return "response"
+
+    def _fail_pending(self, exc: MCPError) -> None:
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(exc)
 
     def _initialize(self) -> None:
         try:
@@ -112,7 +422,11 @@ class StdioClient(MCPClient):
                 "capabilities": {},
                 "clientInfo": {"name": "mcp-to-skills", "version": "0.1"},
             }
-            self.request("initialize", params)
+            request_id, future = self._send_request("initialize", params)
+            try:
+                future.result(timeout=self._response_timeout_seconds)
+            finally:
+                self._discard_pending(request_id)
             self._send_notification("initialized", {})
         except Exception as exc:  # pragma: no cover - best effort for unknown servers
             LOGGER.warning(f"initialize_failed for StdioClient: {exc}")
@@ -124,49 +438,102 @@ class StdioClient(MCPClient):
     def _write_payload(self, payload: dict[str, Any]) -> None:
         if self._process.stdin is None:
             raise MCPError("stdio process stdin unavailable")
-        encoded = json.dumps(payload)
-        self._process.stdin.write(encoded + "\n")
-        self._process.stdin.flush()
-
-    def _read_response(self, request_id: int) -> Any:
-        if self._process.stdout is None:
-            raise MCPError("stdio process stdout unavailable")
-        deadline = time.monotonic() + self._response_timeout_seconds
-        while True:
-            remaining = deadline - time.monotonic()
-            if remaining <= 0:
-                raise MCPError("stdio response timed out")
-            try:
-                line = self._stdout_queue.get(timeout=remaining)
-            except queue.Empty:
-                if self._stdout_closed.is_set():
-                    raise MCPError("stdio process closed while awaiting response")
-                raise MCPError("stdio response timed out")
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                message = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            if message.get("id") != request_id:
-                continue
-            if "error" in message:
-                raise MCPError(message["error"])
-            return message.get("result")
-
-    def request(self, method: str, params: dict[str, Any] | None) -> Any:
+        with trace_span("write_payload", method=payload.get("method")) as span:
+            encoded = json.dumps(payload).encode("utf-8")
+            span["bytes"] = len(encoded)
+            with self._write_lock:
+                try:
+                    self._process.stdin.write(encoded)
+                    self._process.stdin.write(b"\n")
+                    self._process.stdin.flush()
+                except (BrokenPipeError, OSError, ValueError) as exc:
+                    raise MCPError(f"stdio process stdin closed: {exc}") from exc
+
+    def _send_request(self, method: str, params: dict[str, Any] | None) -> tuple[int, Future[Any]]:
+        request_id, future, payload = self._register_request(method, params)
+        self._write_request(request_id, payload)
+        return request_id, future
+
+    def _register_request(
+        self, method: str, params: dict[str, Any] | None
+    ) -> tuple[int, Future[Any], dict[str, Any]]:
+        future: Future[Any] = Future()
         with self._lock:
+            if self._stdout_closed.is_set():
+                raise MCPError("stdio process closed while awaiting response")
             request_id = self._next_id
             self._next_id += 1
-            payload = {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "method": method,
-                "params": params or {},
-            }
+            self._pending[request_id] = future
+        payload = {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": method,
+            "params": params or {},
+        }
+        return request_id, future, payload
+
+    def _write_request(self, request_id: int, payload: dict[str, Any]) -> None:
+        try:
             self._write_payload(payload)
-            return self._read_response(request_id)
+        except MCPError:
+            self._discard_pending(request_id)
+            raise
+
+    def _discard_pending(self, request_id: int) -> None:
+        with self._lock:
+            self._pending.pop(request_id, None)
+
+    def _cancel_upstream(self, request_id: int, reason: str) -> None:
+        """Tell the server to stop working on an abandoned request (best effort)."""
+        try:
+            self._send_notification("notifications/cancelled", {"requestId": request_id, "reason": reason})
+        except MCPError:
+            pass
+
+    def request(self, method: str, params: dict[str, Any] | None) -> Any:
+        timeout = self._call_timeout()
+        params, progress_token = PROGRESS.attach(method, params)
+        try:
+            request_id, future = self._send_request(method, params)
+            try:
+                return future.result(timeout=timeout)
+            except TimeoutError:
+                self._cancel_upstream(request_id, f"timed out after {timeout:g}s")
+                raise MCPTimeoutError(f"stdio response timed out after {timeout:g}s") from None
+            finally:
+                self._discard_pending(request_id)
+        finally:
+            PROGRESS.release(progress_token)
+
+    async def request_async(self, method: str, params: dict[str, Any] | None) -> Any:
+        # The reader thread resolves the same futures, so awaiting them needs no worker thread.
+        # Pipe writes block once the child stops reading stdin, so they run off the event loop.
+        timeout = self._call_timeout()
+        params, progress_token = PROGRESS.attach(method, params)
+        try:
+            request_id, future, payload = self._register_request(method, params)
+            try:
+                return await asyncio.wait_for(self._write_and_wait(request_id, payload, future), timeout)
+            except TimeoutError:
+                self._cancel_upstream_soon(request_id, f"timed out after {timeout:g}s")
+                raise MCPTimeoutError(f"stdio response timed out after {timeout:g}s") from None
+            except asyncio.CancelledError:
+                self._cancel_upstream_soon(request_id, "caller cancelled the request")
+                raise
+            finally:
+                self._discard_pending(request_id)
+        finally:
+            PROGRESS.release(progress_token)
+
+    async def _write_and_wait(self, request_id: int, payload: dict[str, Any], future: Future[Any]) -> Any:
+        await asyncio.to_thread(self._write_request, request_id, payload)
+        return await asyncio.wrap_future(future)
+
+    def _cancel_upstream_soon(self, request_id: int, reason: str) -> None:
+        """Send the cancel from a worker thread without waiting for it."""
+        task = asyncio.ensure_future(asyncio.to_thread(self._cancel_upstream, request_id, reason))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
 
     def list_tools(self) -> list[ToolDef]:
         result = self.request("tools/list", {}) or {}
@@ -176,16 +543,466 @@ class StdioClient(MCPClient):
         params = {"name": tool_name, "arguments": arguments or {}}
         return self.request("tools/call", params)
 
+    def is_alive(self) -> bool:
+        return self._process.poll() is None and not self._stdout_closed.is_set()
+
+    @property
+    def returncode(self) -> int | None:
+        return self._process.poll()
+
+    def pids(self) -> list[int]:
+        return [self._process.pid] if self._process.poll() is None else []
+
     def close(self) -> None:
         if self._process.poll() is None:
             self._process.terminate()
+            # Reap it off the caller's thread so it does not linger as a zombie.
+            threading.Thread(target=self._reap, daemon=True).start()
+
+    def _reap(self) -> None:
+        try:
+            self._process.wait(timeout=self._terminate_grace_seconds)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+
+
+class SupervisedStdioClient(MCPClient):
+    """Keeps a stdio server running: respawns a dead process and can hold warm spares.
+
+    Liveness is checked on every call (``process.poll()`` and the stdout-closed event), so a
+    crashed server is replaced and re-initialized on the next call instead of timing out.
+    Restarts back off exponentially while the server keeps dying shortly after starting.
+    Requests that were in flight when a process died fail immediately and are not retried.
+    """
+
+    _backoff_base_seconds = 0.5
+    _backoff_max_seconds = 30.0
+    # A process that lived at least this long resets the backoff.
+    _stable_seconds = 60.0
+
+    def __init__(
+        self,
+        server_id: str,
+        command: str,
+        args: list[str],
+        env: dict[str, str],
+        warm_spares: int = 0,
+        response_timeout: float | None = None,
+    ) -> None:
+        self._server_id = server_id
+        self._command = command
+        self._args = args
+        self._env = env
+        self._warm_spares = warm_spares
+        self._response_timeout = response_timeout
+        self._lock = threading.Lock()
+        self._spares: list[StdioClient] = []
+        self._spares_lock = threading.Lock()
+        self._refilling = False
+        self._closed = False
+        self._failures = 0
+        self._respawn_at: float | None = None
+        self.restarts = 0
+        self._client = self._spawn()
+        self._started_at = time.monotonic()
+        self._refill_spares_async()
+
+    def set_notification_handler(self, handler: NotificationHandler | None) -> None:
+        super().set_notification_handler(handler)
+        with self._spares_lock:
+            clients = [self._client, *self._spares]
+        for client in clients:
+            client.set_notification_handler(handler)
+
+    def _new_client(self) -> StdioClient:
+        client = StdioClient(self._command, self._args, self._env, self._response_timeout)
+        client.set_notification_handler(self._notification_handler)
+        return client
+
+    def _spawn(self) -> StdioClient:
+        spare = None
+        with self._spares_lock:
+            while self._spares:
+                spare = self._spares.pop()
+                if spare.is_alive():
+                    break
+                spare.close()
+                spare = None
+        if spare is not None:
+            self._refill_spares_async()
+            return spare
+        return self._new_client()
+
+    def _refill_spares_async(self) -> None:
+        if self._warm_spares <= 0:
+            return
+        with self._spares_lock:
+            if self._refilling:
+                return
+            self._refilling = True
+        threading.Thread(target=self._refill_spares, daemon=True).start()
+
+    def _refill_spares(self) -> None:
+        try:
+            while not self._closed:
+                with self._spares_lock:
+                    if len(self._spares) >= self._warm_spares:
+                        return
+                spare = self._new_client()
+                with self._spares_lock:
+                    if self._closed:
+                        spare.close()
+                        return
+                    self._spares.append(spare)
+        except Exception as exc:
+            LOGGER.warning(f"warm_spare_failed, for server_id={self._server_id}: {exc}")
+        finally:
+            with self._spares_lock:
+                self._refilling = False
+
+    def _backoff_delay(self) -> float:
+        # The first restart after a crash is immediate; repeated quick crashes back off.
+        if self._failures <= 1:
+            return 0.0
+        return min(self._backoff_base_seconds * 2 ** (self._failures - 2), self._backoff_max_seconds)
+
+    def _restart(self) -> StdioClient:
+        with self._lock:
+            client = self._client
+            if client.is_alive():
+                return client
+            if self._closed:
+                raise MCPError(f"stdio server {self._server_id} is closed")
+            if self._respawn_at is None:
+                # First caller to notice this exit schedules the respawn.
+                uptime = time.monotonic() - self._started_at
+                self._failures = 0 if uptime >= self._stable_seconds else self._failures + 1
+                delay = self._backoff_delay()
+                LOGGER.warning(
+                    f"stdio_server_exited, for server_id={self._server_id}: exit code {client.returncode}, "
+                    f"restarting in {delay:.1f}s"
+                )
+                client.close()
+                self._respawn_at = time.monotonic() + delay
+            wait_seconds = self._respawn_at - time.monotonic()
+        # Back off without holding the lock, so current() and other callers are not stuck on it.
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+        with self._lock:
+            if self._client is not client:
+                return self._client  # another caller already respawned it
+            if self._closed:
+                raise MCPError(f"stdio server {self._server_id} is closed")
+            retry_in = self._respawn_at - time.monotonic()
+            if retry_in > 0:
+                # A spawn attempt failed while we slept and scheduled the next one.
+                raise MCPError(f"stdio server {self._server_id} failed to restart, retrying in {retry_in:.1f}s")
+            try:
+                self._client = self._spawn()
+            except Exception as exc:
+                self._failures += 1
+                delay = self._backoff_delay()
+                LOGGER.warning(
+                    f"stdio_server_spawn_failed, for server_id={self._server_id}: {exc}, retrying in {delay:.1f}s"
+                )
+                self._respawn_at = time.monotonic() + delay
+                raise
+            self._started_at = time.monotonic()
+            self._respawn_at = None
+            self.restarts += 1
+            return self._client
+
+    def current(self) -> StdioClient:
+        client = self._client
+        if client.is_alive():
+            return client
+        return self._restart()
+
+    def is_alive(self) -> bool:
+        return self._client.is_alive()
+
+    def pids(self) -> list[int]:
+        with self._spares_lock:
+            clients = [self._client, *self._spares]
+        return [pid for client in clients for pid in client.pids()]
+
+    def request(self, method: str, params: dict[str, Any] | None) -> Any:
+        return self.current().request(method, params)
+
+    async def request_async(self, method: str, params: dict[str, Any] | None) -> Any:
+        client = self._client
+        if not client.is_alive():
+            client = await asyncio.to_thread(self._restart)
+        return await client.request_async(method, params)
+
+    def list_tools(self) -> list[ToolDef]:
+        return self.current().list_tools()
+
+    def call_tool(self, tool_name: str, arguments: dict[str, Any] | None) -> Any:
+        return self.current().call_tool(tool_name, arguments)
+
+    def close(self) -> None:
+        self._closed = True
+        with self._spares_lock:
+            spares = list(self._spares)
+            self._spares.clear()
+        for spare in spares:
+            spare.close()
+        self._client.close()
+
+
+class PooledStdioClient(MCPClient):
+    """Spreads requests over ``size`` supervised processes of the same stdio server.
+
+    Each request goes to the worker with the fewest outstanding requests. When the call
+    carries a session key (``SESSION_KEY``), the key is pinned to one worker so stateful
+    servers such as browser sessions keep talking to the same process. Pins are kept for
+    the ``_max_sessions`` most recent keys and dropped when their worker restarts, since
+    the session state died with the old process.
+    """
+
+    _max_sessions = 1024
+
+    def __init__(
+        self,
+        server_id: str,
+        command: str,
+        args: list[str],
+        env: dict[str, str],
+        size: int,
+        warm_spares: int = 0,
+        response_timeout: float | None = None,
+    ) -> None:
+        self._server_id = server_id
+        with ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"{server_id}-pool") as executor:
+            futures = [
+                executor.submit(
+                    SupervisedStdioClient, server_id, command, args, env, warm_spares, response_timeout
+                )
+                for _ in range(size)
+            ]
+        started = [future.result() for future in futures if future.exception() is None]
+        if len(started) < size:
+            for worker in started:
+                worker.close()
+            raise next(future.exception() for future in futures if future.exception() is not None)
+        self._workers: list[SupervisedStdioClient] = started
+        self._outstanding = [0] * size
+        # Session key -> (worker index, that worker's restart count when pinned).
+        self._sessions: OrderedDict[str, tuple[int, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def set_notification_handler(self, handler: NotificationHandler | None) -> None:
+        super().set_notification_handler(handler)
+        for worker in self._workers:
+            worker.set_notification_handler(handler)
+
+    @property
+    def restarts(self) -> int:
+        return sum(worker.restarts for worker in self._workers)
+
+    def _acquire(self) -> int:
+        session_key = SESSION_KEY.get()
+        with self._lock:
+            index = None
+            if session_key is not None:
+                pinned = self._sessions.get(session_key)
+                if pinned is not None and self._workers[pinned[0]].restarts == pinned[1]:
+                    index = pinned[0]
+                    self._sessions.move_to_end(session_key)
+            if index is None:
+                index = min(range(len(self._workers)), key=self._outstanding.__getitem__)
+                if session_key is not None:
+                    self._sessions[session_key] = (index, self._workers[index].restarts)
+                    self._sessions.move_to_end(session_key)
+                    while len(self._sessions) > self._max_sessions:
+                        self._sessions.popitem(last=False)
+            self._outstanding[index] += 1
+        return index
+
+    def _release(self, index: int) -> None:
+        with self._lock:
+            self._outstanding[index] -= 1
+
+    def is_alive(self) -> bool:
+        return any(worker.is_alive() for worker in self._workers)
+
+    def pids(self) -> list[int]:
+        return [pid for worker in self._workers for pid in worker.pids()]
+
+    def request(self, method: str, params: dict[str, Any] | None) -> Any:
+        index = self._acquire()
+        try:
+            return self._workers[index].request(method, params)
+        finally:
+            self._release(index)
+
+    async def request_async(self, method: str, params: dict[str, Any] | None) -> Any:
+        index = self._acquire()
+        try:
+            return await self._workers[index].request_async(method, params)
+        finally:
+            self._release(index)
+
+    def list_tools(self) -> list[ToolDef]:
+        result = self.request("tools/list", {}) or {}
+        return parse_tools(result)
+
+    def call_tool(self, tool_name: str, arguments: dict[str, Any] | None) -> Any:
+        params = {"name": tool_name, "arguments": arguments or {}}
+        return self.request("tools/call", params)
+
+    def close(self) -> None:
+        for worker in self._workers:
+            worker.close()
+
+
+class HttpConnectionPool:
+    """Keep-alive HTTP(S) connections to one MCP endpoint, reused across requests.
+
+    Up to ``size`` connections are kept and handed to the next request so the TCP/TLS
+    handshake is paid only once. When all of them are busy (e.g. with long SSE tool
+    calls) a request gets a temporary connection instead of waiting for a slot.
+    Redirects are not followed: a JSON-RPC POST cannot be replayed safely, so a 3xx
+    answer is reported as an error naming the new location.
+    """
+
+    _timeout_seconds = 30
+    _stale_errors = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+    def __init__(self, url: str, size: int) -> None:
+        parsed = urllib.parse.urlsplit(url)
+        if parsed.scheme not in {"http", "https"} or not parsed.hostname:
+            raise MCPError(f"Unsupported MCP server url: {url}")
+        self._scheme = parsed.scheme
+        self._host = parsed.hostname
+        self._port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self._path = parsed.path or "/"
+        if parsed.query:
+            self._path = f"{self._path}?{parsed.query}"
+        self._proxy = self._resolve_proxy(url)
+        if self._proxy is not None and self._scheme == "http":
+            # Plain HTTP through a proxy sends the absolute URL as the request target.
+            self._path = url
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: list[http.client.HTTPConnection] = []
+        self._idle_lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context() if self._scheme == "https" else None
+
+    def _resolve_proxy(self, url: str) -> urllib.parse.SplitResult | None:
+        proxies = urllib.request.getproxies()
+        proxy_url = proxies.get(self._scheme)
+        if not proxy_url or urllib.request.proxy_bypass(self._host):
+            return None
+        proxy = urllib.parse.urlsplit(proxy_url if "://" in proxy_url else f"http://{proxy_url}")
+        return proxy if proxy.hostname else None
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        host, port = self._host, self._port
+        if self._proxy is not None:
+            host, port = self._proxy.hostname or host, self._proxy.port or 80
+        if self._scheme == "https":
+            connection: http.client.HTTPConnection = http.client.HTTPSConnection(
+                host, port, timeout=self._timeout_seconds, context=self._ssl_context
+            )
+            if self._proxy is not None:
+                connection.set_tunnel(self._host, self._port)
+            return connection
+        return http.client.HTTPConnection(host, port, timeout=self._timeout_seconds)
+
+    def _checkout(self) -> tuple[http.client.HTTPConnection, bool]:
+        with self._idle_lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._new_connection(), False
+
+    def _checkin(self, connection: http.client.HTTPConnection) -> None:
+        with self._idle_lock:
+            self._idle.append(connection)
+
+    @staticmethod
+    def _set_timeout(connection: http.client.HTTPConnection, timeout: float) -> None:
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+
+    @contextmanager
+    def post(
+        self, body: bytes, headers: Mapping[str, str], timeout: float | None = None
+    ) -> Iterator[http.client.HTTPResponse]:
+        """POST ``body`` and yield the response; the connection is reused if the body was consumed.
+
+        ``timeout`` bounds each socket operation of this request (default ``_timeout_seconds``).
+        """
+        request_headers = {"Content-Length": str(len(body)), **headers}
+        timeout = timeout or self._timeout_seconds
+        pooled = self._slots.acquire(blocking=False)
+        try:
+            if pooled:
+                connection, reused = self._checkout()
+            else:
+                connection, reused = self._new_connection(), False
+            self._set_timeout(connection, timeout)
+            try:
+                connection.request("POST", self._path, body=body, headers=request_headers)
+                response = connection.getresponse()
+            except self._stale_errors:
+                connection.close()
+                if not reused:
+                    raise
+                # The server dropped an idle keep-alive connection; retry once on a fresh one.
+                connection = self._new_connection()
+                self._set_timeout(connection, timeout)
+                connection.request("POST", self._path, body=body, headers=request_headers)
+                response = connection.getresponse()
+            except Exception:
+                connection.close()
+                raise
+            if 300 <= response.status < 400:
+                location = response.getheader("Location")
+                connection.close()
+                raise MCPError(f"MCP server redirected ({response.status}) to {location}; update its url")
+            try:
+                yield response
+            finally:
+                if pooled and response.isclosed() and not response.will_close:
+                    self._set_timeout(connection, self._timeout_seconds)
+                    self._checkin(connection)
+                else:
+                    connection.close()
+        finally:
+            if pooled:
+                self._slots.release()
+
+    def close(self) -> None:
+        with self._idle_lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for connection in idle:
+            connection.close()
 
 
 class HttpClient(MCPClient):
-    def __init__(self, url: str, headers: dict[str, str], sse: bool) -> None:
+    # A cancel follows a call that already hit its deadline; don't hold the caller much longer.
+    _cancel_timeout_seconds = 1.0
+
+    def __init__(
+        self,
+        url: str,
+        headers: dict[str, str],
+        sse: bool,
+        pool_size: int = 4,
+        response_timeout: float | None = None,
+    ) -> None:
+        if response_timeout:
+            self._response_timeout_seconds = response_timeout
         self._url = url
         self._headers = headers
         self._sse = sse
+        self._pool = HttpConnectionPool(url, pool_size)
+        self._pool_size = pool_size
+        self._async_http: httpx.AsyncClient | None = None
         self._next_id = 1
         self._lock = threading.Lock()
         self._initialize()
@@ -197,11 +1014,16 @@ class HttpClient(MCPClient):
                 "capabilities": {},
                 "clientInfo": {"name": "mcp-to-skills", "version": "0.1"},
             }
-            self.request("initialize", params)
+            # Bounded by the server's request timeout, not the first call's tool timeout.
+            token = CALL_TIMEOUT.set(self._response_timeout_seconds)
+            try:
+                self.request("initialize", params)
+            finally:
+                CALL_TIMEOUT.reset(token)
         except Exception as exc:  # pragma: no cover - best effort for unknown servers
             LOGGER.warning(f"initialize_failed for HttpClient: {exc}")
 
-    def request(self, method: str, params: dict[str, Any] | None) -> Any:
+    def _build_payload(self, method: str, params: dict[str, Any] | None) -> tuple[int, dict[str, Any]]:
         with self._lock:
             request_id = self._next_id
             self._next_id += 1
@@ -211,25 +1033,123 @@ class HttpClient(MCPClient):
             "method": method,
             "params": params or {},
         }
-        if self._sse:
-            return self._request_sse(request_id, payload)
-        return self._request_http(request_id, payload)
-
-    def _request_http(self, request_id: int, payload: dict[str, Any]) -> Any:
-        response = _post_json(self._url, payload, self._headers)
-        if response.get("id") != request_id:
-            raise MCPError("mismatched response id")
-        if "error" in response:
-            raise MCPError(response["error"])
-        return response.get("result")
-
-    def _request_sse(self, request_id: int, payload: dict[str, Any]) -> Any:
-        response = _post_sse(self._url, payload, self._headers)
-        if response.get("id") != request_id:
-            raise MCPError("mismatched response id")
-        if "error" in response:
-            raise MCPError(response["error"])
-        return response.get("result")
+        return request_id, payload
+
+    def request(self, method: str, params: dict[str, Any] | None) -> Any:
+        timeout = self._call_timeout()
+        params, progress_token = PROGRESS.attach(method, params)
+        request_id, payload = self._build_payload(method, params)
+        try:
+            if self._sse:
+                return self._request_sse(request_id, payload, timeout)
+            return self._request_http(request_id, payload, timeout)
+        except TimeoutError:
+            self._cancel_upstream(request_id, f"timed out after {timeout:g}s")
+            raise MCPTimeoutError(f"HTTP response timed out after {timeout:g}s") from None
+        finally:
+            PROGRESS.release(progress_token)
+
+    def _request_http(self, request_id: int, payload: dict[str, Any], timeout: float) -> Any:
+        response = _post_json(self._pool, payload, self._headers, timeout)
+        return _unwrap_response(response, request_id)
+
+    def _request_sse(self, request_id: int, payload: dict[str, Any], timeout: float) -> Any:
+        response = _post_sse(
+            self._pool, payload, self._headers, request_id, self._handle_notification, timeout
+        )
+        return _unwrap_response(response, request_id)
+
+    def _cancel_upstream(self, request_id: int, reason: str) -> None:
+        """Tell the server to stop working on an abandoned request (best effort)."""
+        payload = {
+            "jsonrpc": "2.0",
+            "method": "notifications/cancelled",
+            "params": {"requestId": request_id, "reason": reason},
+        }
+        body = json.dumps(payload).encode("utf-8")
+        try:
+            with self._pool.post(
+                body, _json_rpc_headers(self._headers), timeout=self._cancel_timeout_seconds
+            ) as response:
+                response.read()
+        except (MCPError, OSError, http.client.HTTPException) as exc:
+            LOGGER.debug(f"cancel_notification_failed: {exc}")
+
+    def _get_async_http(self) -> httpx.AsyncClient:
+        if self._async_http is None:
+            limits = httpx.Limits(
+                max_connections=self._pool_size,
+                max_keepalive_connections=self._pool_size,
+            )
+            self._async_http = httpx.AsyncClient(
+                limits=limits,
+                timeout=HttpConnectionPool._timeout_seconds,
+                trust_env=True,
+            )
+        return self._async_http
+
+    async def request_async(self, method: str, params: dict[str, Any] | None) -> Any:
+        timeout = self._call_timeout()
+        params, progress_token = PROGRESS.attach(method, params)
+        request_id, payload = self._build_payload(method, params)
+        try:
+            return await asyncio.wait_for(self._post_async(request_id, payload), timeout)
+        except TimeoutError:
+            await self._cancel_upstream_async(request_id, f"timed out after {timeout:g}s")
+            raise MCPTimeoutError(f"HTTP response timed out after {timeout:g}s") from None
+        except asyncio.CancelledError:
+            task = asyncio.ensure_future(self._cancel_upstream_async(request_id, "caller cancelled the request"))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+            raise
+        finally:
+            PROGRESS.release(progress_token)
+
+    async def _cancel_upstream_async(self, request_id: int, reason: str) -> None:
+        """Tell the server to stop working on an abandoned request (best effort)."""
+        payload = {
+            "jsonrpc": "2.0",
+            "method": "notifications/cancelled",
+            "params": {"requestId": request_id, "reason": reason},
+        }
+        try:
+            await self._get_async_http().post(
+                self._url,
+                content=json.dumps(payload).encode("utf-8"),
+                headers=_json_rpc_headers(self._headers),
+                timeout=self._cancel_timeout_seconds,
+            )
+        except httpx.HTTPError as exc:
+            LOGGER.debug(f"cancel_notification_failed: {exc}")
+
+    async def _post_async(self, request_id: int, payload: dict[str, Any]) -> Any:
+        body = json.dumps(payload).encode("utf-8")
+        client = self._get_async_http()
+        try:
+            async with client.stream(
+                "POST", self._url, content=body, headers=_json_rpc_headers(self._headers)
+            ) as response:
+                if response.status_code >= 400:
+                    error_body = (await response.aread()).decode("utf-8", errors="replace")
+                    raise MCPError(f"HTTP error {response.status_code}: {error_body}")
+                content_type = response.headers.get("Content-Type", "")
+                if "text/event-stream" in content_type:
+                    message = None
+                    async for event in aiter_sse_events(response.aiter_lines()):
+                        message = _match_sse_event(event, request_id, self._handle_notification)
+                        if message is not None:
+                            break
+                    if message is None:
+                        raise MCPError("No JSON response received from SSE stream")
+                else:
+                    content = (await response.aread()).decode("utf-8", errors="replace")
+                    try:
+                        message = json.loads(content)
+                    except json.JSONDecodeError as exc:
+                        raise MCPError("Invalid JSON response from MCP server") from exc
+        except httpx.HTTPError as exc:
+            raise MCPError(f"HTTP request failed: {exc}") from exc
+        return _unwrap_response(message, request_id)
 
     def list_tools(self) -> list[ToolDef]:
         result = self.request("tools/list", {}) or {}
@@ -239,49 +1159,561 @@ class HttpClient(MCPClient):
         params = {"name": tool_name, "arguments": arguments or {}}
         return self.request("tools/call", params)
 
+    def close(self) -> None:
+        self._pool.close()
+
+    async def aclose(self) -> None:
+        self._pool.close()
+        if self._async_http is not None:
+            await self._async_http.aclose()
+            self._async_http = None
+
+
+def _is_timeout(exc: BaseException) -> bool:
+    return isinstance(exc, (TimeoutError, MCPTimeoutError, httpx.TimeoutException))
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+MetricSample = tuple[str, Mapping[str, str], float]
+
+# JSON-RPC methods recorded under their own name; tools are labelled only once discovered,
+# anything else the caller sends is counted as "unknown" to keep label sets bounded.
+KNOWN_METHODS = frozenset(
+    {
+        "initialize",
+        "ping",
+        "tools/list",
+        "tools/call",
+        "resources/list",
+        "resources/read",
+        "resources/templates/list",
+        "resources/subscribe",
+        "resources/unsubscribe",
+        "prompts/list",
+        "prompts/get",
+        "completion/complete",
+        "logging/setLevel",
+    }
+)
+
+
+class Metrics:
+    """Thread-safe counters and latency histograms rendered in the Prometheus text format.
+
+    Gauges that mirror live state (in-flight calls, restarts, memory) are read at render
+    time from registered collectors instead of being updated on every call.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_SECONDS) -> None:
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self._families: dict[str, tuple[str, str]] = {}
+        self._counters: dict[str, dict[tuple[tuple[str, str], ...], float]] = {}
+        self._histograms: dict[str, dict[tuple[tuple[str, str], ...], list[float]]] = {}
+        self._collectors: list[tuple[str, str, str, Callable[[], Iterable[MetricSample]]]] = []
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        self._families.setdefault(name, (kind, help_text))
+
+    def inc(self, name: str, labels: Mapping[str, str], amount: float = 1.0) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, labels: Mapping[str, str], value: float) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # Per-bucket counts (made cumulative when rendering), then sum and count.
+            state = series.setdefault(key, [0.0] * (len(self._buckets) + 3))
+            state[bisect_left(self._buckets, value)] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def add_collector(
+        self, name: str, kind: str, help_text: str, collect: Callable[[], Iterable[MetricSample]]
+    ) -> None:
+        self._collectors.append((name, kind, help_text, collect))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {
+                name: {key: list(state) for key, state in series.items()}
+                for name, series in self._histograms.items()
+            }
+        for name, (kind, help_text) in self._families.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for key, value in sorted(counters.get(name, {}).items()):
+                lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for key, state in sorted(histograms.get(name, {}).items()):
+                cumulative = 0.0
+                for bound, count in zip([*self._buckets, float("inf")], state):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f"{name}_bucket{_format_labels((*key, ('le', le)))} {cumulative:g}")
+                lines.append(f"{name}_sum{_format_labels(key)} {state[-2]:.6f}")
+                lines.append(f"{name}_count{_format_labels(key)} {state[-1]:g}")
+        for name, kind, help_text, collect in self._collectors:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for sample_name, labels, value in collect():
+                lines.append(f"{sample_name}{_format_labels(tuple(sorted(labels.items())))} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def serve_metrics(metrics: Metrics, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve ``GET /metrics`` on a daemon thread for Prometheus or curl."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            LOGGER.debug(f"metrics_http: {format % args}")
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    LOGGER.info(f"metrics_endpoint_started: http://{host}:{server.server_port}/metrics")
+    return server
+
+
+@dataclass
+class CallTimer:
+    """Splits a bridged call into queue wait (until its client is ready) and upstream time."""
+
+    started: float = field(default_factory=time.perf_counter)
+    sent: float | None = None
+
+    def mark_sent(self) -> None:
+        self.sent = time.perf_counter()
+
+
+def read_process_table() -> dict[int, tuple[int, int]]:
+    """Map pid -> (parent pid, resident set size in bytes) for all processes, via ``ps``."""
+    try:
+        output = subprocess.run(
+            ["ps", "-A", "-o", "pid=,ppid=,rss="],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return {}
+    table: dict[int, tuple[int, int]] = {}
+    for line in output.splitlines():
+        fields = line.split()
+        if len(fields) != 3 or not all(field.isdigit() for field in fields):
+            continue
+        table[int(fields[0])] = (int(fields[1]), int(fields[2]) * 1024)
+    return table
+
+
+def process_tree_rss(root_pids: Iterable[int], table: Mapping[int, tuple[int, int]]) -> int:
+    """Total RSS of ``root_pids`` and all their descendants (npx/uvx wrappers fork the real server)."""
+    children: dict[int, list[int]] = {}
+    for pid, (ppid, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    total = 0
+    seen: set[int] = set()
+    stack = list(root_pids)
+    while stack:
+        pid = stack.pop()
+        if pid in seen or pid not in table:
+            continue
+        seen.add(pid)
+        total += table[pid][1]
+        stack.extend(children.get(pid, []))
+    return total
+
+
+@dataclass(frozen=True)
+class ResidencyLimits:
+    """When MCPManager stops local server processes; they restart lazily on the next call."""
+
+    idle_timeout_seconds: float = DEFAULT_IDLE_TIMEOUT_SECONDS
+    max_resident_servers: int = 0
+    max_resident_rss_bytes: int = 0
+
 
 class MCPManager:
-    def __init__(self, servers: list[ServerConfig]) -> None:
+    _janitor_max_interval_seconds = 15.0
+
+    def __init__(
+        self,
+        servers: list[ServerConfig],
+        limits: ResidencyLimits | None = None,
+        metrics: Metrics | None = None,
+    ) -> None:
         self._servers = {server.id: server for server in servers}
         self._clients: dict[str, MCPClient] = {}
+        self._lock = threading.Lock()
+        self._client_locks: dict[str, threading.Lock] = {}
+        self._limits = limits or ResidencyLimits()
+        self._last_used: dict[str, float] = {}
+        self._in_flight: dict[str, int] = {}
+        self._rss: dict[str, int] = {}
+        self._evicted: set[str] = set()
+        # Restarts of evicted clients, so the per-server counter survives their replacement.
+        self._past_restarts: dict[str, int] = {}
+        self._known_tools: dict[str, frozenset[str]] = {}
+        self._metrics = metrics
+        if metrics is not None:
+            self._register_metrics(metrics)
+        self._closed = threading.Event()
+        self._janitor: threading.Thread | None = None
+        interval = self._janitor_interval()
+        if interval is not None:
+            self._janitor = threading.Thread(target=self._run_janitor, args=(interval,), daemon=True)
+            self._janitor.start()
+
+    def _idle_timeout(self, server_id: str) -> float:
+        configured = self._servers[server_id].idle_timeout_seconds
+        return self._limits.idle_timeout_seconds if configured is None else configured
+
+    def _janitor_interval(self) -> float | None:
+        timeouts = [self._idle_timeout(server_id) for server_id in self._servers]
+        timeouts = [timeout for timeout in timeouts if timeout > 0]
+        if not timeouts and not self._limits.max_resident_servers and not self._limits.max_resident_rss_bytes:
+            return None
+        shortest = min(timeouts) / 2 if timeouts else self._janitor_max_interval_seconds
+        return max(1.0, min(shortest, self._janitor_max_interval_seconds))
+
+    def _run_janitor(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            try:
+                self.evict_idle()
+            except Exception as exc:  # pragma: no cover - keep the janitor alive
+                LOGGER.warning(f"client_eviction_failed: {exc}")
+
+    def _register_metrics(self, metrics: Metrics) -> None:
+        metrics.describe("dev_swarm_requests_total", "counter", "Bridged calls per server and tool or method.")
+        metrics.describe(
+            "dev_swarm_request_errors_total", "counter", "Bridged calls that raised, including timeouts."
+        )
+        metrics.describe("dev_swarm_request_timeouts_total", "counter", "Bridged calls that timed out.")
+        metrics.describe(
+            "dev_swarm_queue_wait_seconds", "histogram", "Time waiting for the server's client to be ready."
+        )
+        metrics.describe("dev_swarm_upstream_seconds", "histogram", "Time from sending a call to its response.")
+        metrics.describe("dev_swarm_server_evictions_total", "counter", "Servers stopped while idle.")
+        metrics.add_collector(
+            "dev_swarm_in_flight_requests",
+            "gauge",
+            "Calls currently in flight per server.",
+            lambda: [
+                ("dev_swarm_in_flight_requests", {"server": server_id}, count)
+                for server_id, count in sorted(dict(self._in_flight).items())
+            ],
+        )
+        metrics.add_collector(
+            "dev_swarm_server_restarts_total",
+            "counter",
+            "Stdio server processes respawned after exiting.",
+            lambda: [
+                ("dev_swarm_server_restarts_total", {"server": server_id}, restarts)
+                for server_id, restarts in sorted(self._restarts().items())
+            ],
+        )
+        metrics.add_collector(
+            "dev_swarm_server_resident_bytes",
+            "gauge",
+            "RSS of each running server's process tree.",
+            lambda: [
+                ("dev_swarm_server_resident_bytes", {"server": server_id}, rss)
+                for server_id, rss in sorted(self._resident_rss().items())
+            ],
+        )
+
+    def _restarts(self) -> dict[str, int]:
+        with self._lock:
+            restarts = dict(self._past_restarts)
+            for server_id, client in self._clients.items():
+                restarts[server_id] = restarts.get(server_id, 0) + client.restarts
+        return restarts
+
+    @contextmanager
+    def _track(self, server_id: str, operation: str) -> Iterator[CallTimer]:
+        """Mark a call in flight so the server is never evicted underneath it, and time it."""
+        if server_id not in self._servers:
+            raise MCPError(f"Unknown server_id: {server_id}")
+        timer = CallTimer()
+        timeout_token = CALL_TIMEOUT.set(self._timeout_for(server_id, operation))
+        with self._lock:
+            self._in_flight[server_id] = self._in_flight.get(server_id, 0) + 1
+            self._last_used[server_id] = time.monotonic()
+        error: BaseException | None = None
+        try:
+            yield timer
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            finished = time.perf_counter()
+            CALL_TIMEOUT.reset(timeout_token)
+            with self._lock:
+                self._in_flight[server_id] -= 1
+                self._last_used[server_id] = time.monotonic()
+            if self._metrics is not None:
+                self._record_call(server_id, operation, timer, finished, error)
+            tracer = _TRACER
+            if tracer is not None:
+                sent = timer.sent if timer.sent is not None else finished
+                args = {"server": server_id, "tool": operation}
+                tracer.record("get_client", timer.started, sent, args)
+                if timer.sent is not None:
+                    tracer.record("upstream", sent, finished, {**args, "error": error is not None})
+
+    def set_known_tools(self, server_id: str, tools: Iterable[ToolDef]) -> None:
+        """Tool names that may appear as metric labels for ``server_id``."""
+        self._known_tools[server_id] = frozenset(tool.name for tool in tools)
+
+    def _metric_labels(self, server_id: str, operation: str) -> dict[str, str]:
+        if server_id not in self._servers:
+            return {"server": "unknown", "tool": "unknown"}
+        if operation not in KNOWN_METHODS and operation not in self._known_tools.get(server_id, ()):
+            operation = "unknown"
+        return {"server": server_id, "tool": operation}
+
+    def _timeout_for(self, server_id: str, operation: str) -> float | None:
+        config = self._servers.get(server_id)
+        if config is None:
+            return None
+        return config.tool_timeouts.get(operation, config.request_timeout_seconds)
+
+    def _record_call(
+        self, server_id: str, operation: str, timer: CallTimer, finished: float, error: BaseException | None
+    ) -> None:
+        metrics = self._metrics
+        if metrics is None:
+            return
+        labels = self._metric_labels(server_id, operation)
+        metrics.inc("dev_swarm_requests_total", labels)
+        sent = timer.sent if timer.sent is not None else finished
+        metrics.observe("dev_swarm_queue_wait_seconds", labels, sent - timer.started)
+        if timer.sent is not None:
+            metrics.observe("dev_swarm_upstream_seconds", labels, finished - timer.sent)
+        if error is not None:
+            metrics.inc("dev_swarm_request_errors_total", labels)
+            if _is_timeout(error):
+                metrics.inc("dev_swarm_request_timeouts_total", labels)
+
+    def _resident_rss(self) -> dict[str, int]:
+        """RSS per running server: from the last eviction check when memory is capped, else measured now."""
+        if self._limits.max_resident_rss_bytes:
+            return dict(self._rss)
+        with self._lock:
+            clients = dict(self._clients)
+        if not clients:
+            return {}
+        table = read_process_table()
+        return {server_id: process_tree_rss(client.pids(), table) for server_id, client in clients.items()}
+
+    def evict_idle(self) -> list[str]:
+        """Stop idle servers past their timeout, then LRU servers beyond the residency caps."""
+        # `ps` is only worth running every check when memory is capped.
+        table = read_process_table() if self._limits.max_resident_rss_bytes and self._clients else {}
+        now = time.monotonic()
+        evicted: list[MCPClient] = []
+        evicted_ids: list[str] = []
+        with self._lock:
+            resident = {server_id: client for server_id, client in self._clients.items() if client.pids()}
+            self._rss = {
+                server_id: process_tree_rss(client.pids(), table) for server_id, client in resident.items()
+            } if table else {}
+            idle = sorted(
+                (server_id for server_id in resident if not self._in_flight.get(server_id)),
+                key=lambda server_id: self._last_used.get(server_id, 0.0),
+            )
+
+            def evict(server_id: str, reason: str) -> None:
+                client = self._clients.pop(server_id)
+                self._past_restarts[server_id] = self._past_restarts.get(server_id, 0) + client.restarts
+                evicted.append(client)
+                resident.pop(server_id, None)
+                idle.remove(server_id)
+                self._evicted.add(server_id)
+                evicted_ids.append(server_id)
+                if self._metrics is not None:
+                    self._metrics.inc("dev_swarm_server_evictions_total", {"server": server_id})
+                LOGGER.info(f"client_evicted, for server_id={server_id}: {reason}")
+
+            for server_id in list(idle):
+                timeout = self._idle_timeout(server_id)
+                idle_for = now - self._last_used.get(server_id, now)
+                if timeout > 0 and idle_for >= timeout:
+                    evict(server_id, f"idle for {idle_for:.0f}s")
+            max_servers = self._limits.max_resident_servers
+            while max_servers and len(resident) > max_servers and idle:
+                evict(idle[0], f"more than {max_servers} resident servers")
+            max_rss = self._limits.max_resident_rss_bytes
+            while max_rss and sum(self._rss.get(server_id, 0) for server_id in resident) > max_rss and idle:
+                evict(idle[0], f"resident memory above {max_rss // (1024 * 1024)} MB")
+            for server_id in evicted_ids:
+                self._rss.pop(server_id, None)
+        for client in evicted:
+            client.close()
+        return evicted_ids
 
     def get_client(self, server_id: str) -> MCPClient:
+        client = self._clients.get(server_id)
+        if client is not None:
+            return client
+        with self._lock:
+            client_lock = self._client_locks.setdefault(server_id, threading.Lock())
+        # Serialize startup per server so concurrent first calls share one client.
+        if not client_lock.acquire(blocking=False):
+            with trace_span("wait_ready", server=server_id):
+                client_lock.acquire()
+        try:
+            client = self._clients.get(server_id)
+            if client is None:
+                client = self._create_client(server_id)
+                with self._lock:
+                    self._clients[server_id] = client
+                    self._evicted.discard(server_id)
+        finally:
+            client_lock.release()
+        return client
+
+    def server_state(self, server_id: str) -> str:
         if server_id in self._clients:
-            return self._clients[server_id]
+            rss = self._rss.get(server_id)  # only tracked with --max-resident-memory-mb
+            return f"running, {rss / (1024 * 1024):.0f} MB" if rss else "running"
+        client_lock = self._client_locks.get(server_id)
+        if client_lock is not None and client_lock.locked():
+            return "starting"
+        if server_id in self._evicted:
+            return "stopped while idle"
+        return "not started"
+
+    def get_config(self, server_id: str) -> ServerConfig:
         config = self._servers.get(server_id)
         if config is None:
             raise MCPError(f"Unknown server_id: {server_id}")
+        return config
+
+    async def get_client_async(self, server_id: str) -> MCPClient:
+        client = self._clients.get(server_id)
+        if client is not None:
+            return client
+        return await asyncio.to_thread(self.get_client, server_id)
+
+    def _create_client(self, server_id: str) -> MCPClient:
+        with trace_span("create_client", server=server_id):
+            return self._build_client(server_id)
+
+    def _build_client(self, server_id: str) -> MCPClient:
+        config = self.get_config(server_id)
         transport = resolve_transport(config)
         if transport == "stdio":
             if not config.command:
                 raise MCPError(f"Missing command for stdio server {server_id}")
-            client: MCPClient = StdioClient(config.command, config.args, config.env)
+            if config.pool_size > 1:
+                client: MCPClient = PooledStdioClient(
+                    server_id,
+                    config.command,
+                    config.args,
+                    config.env,
+                    size=config.pool_size,
+                    warm_spares=config.warm_spares,
+                    response_timeout=config.request_timeout_seconds,
+                )
+            else:
+                client = SupervisedStdioClient(
+                    server_id,
+                    config.command,
+                    config.args,
+                    config.env,
+                    warm_spares=config.warm_spares,
+                    response_timeout=config.request_timeout_seconds,
+                )
         elif transport in {"http", "streamable-http"}:
             if not config.url:
                 raise MCPError(f"Missing url for http server {server_id}")
-            client = HttpClient(config.url, config.headers, sse=(transport == "streamable-http"))
+            client = HttpClient(
+                config.url,
+                config.headers,
+                sse=(transport == "streamable-http"),
+                pool_size=config.connection_pool_size,
+                response_timeout=config.request_timeout_seconds,
+            )
         elif transport == "sse":
             if not config.url:
                 raise MCPError(f"Missing url for sse server {server_id}")
-            client = HttpClient(config.url, config.headers, sse=True)
+            client = HttpClient(
+                config.url,
+                config.headers,
+                sse=True,
+                pool_size=config.connection_pool_size,
+                response_timeout=config.request_timeout_seconds,
+            )
         else:
             raise MCPError(f"Unsupported transport: {transport}")
-        self._clients[server_id] = client
         return client
 
     def list_tools(self, server_id: str) -> list[ToolDef]:
-        return self.get_client(server_id).list_tools()
+        with self._track(server_id, "tools/list") as timer:
+            client = self.get_client(server_id)
+            timer.mark_sent()
+            tools = client.list_tools()
+        self.set_known_tools(server_id, tools)
+        return tools
 
     def call_tool(self, server_id: str, tool_name: str, arguments: dict[str, Any] | None) -> Any:
-        return self.get_client(server_id).call_tool(tool_name, arguments)
+        with self._track(server_id, tool_name) as timer:
+            client = self.get_client(server_id)
+            timer.mark_sent()
+            return client.call_tool(tool_name, arguments)
 
     def request(self, server_id: str, method: str, params: dict[str, Any] | None) -> Any:
-        return self.get_client(server_id).request(method, params)
+        with self._track(server_id, method) as timer:
+            client = self.get_client(server_id)
+            timer.mark_sent()
+            return client.request(method, params)
+
+    async def call_tool_async(self, server_id: str, tool_name: str, arguments: dict[str, Any] | None) -> Any:
+        with self._track(server_id, tool_name) as timer:
+            client = await self.get_client_async(server_id)
+            timer.mark_sent()
+            return await client.call_tool_async(tool_name, arguments)
+
+    async def request_async(self, server_id: str, method: str, params: dict[str, Any] | None) -> Any:
+        with self._track(server_id, method) as timer:
+            client = await self.get_client_async(server_id)
+            timer.mark_sent()
+            return await client.request_async(method, params)
 
     def close(self) -> None:
+        self._closed.set()
         for client in self._clients.values():
             client.close()
 
+    async def aclose(self) -> None:
+        self._closed.set()
+        for client in self._clients.values():
+            await client.aclose()
+
 
 def resolve_transport(config: ServerConfig) -> str:
     if config.transport:
@@ -320,59 +1752,162 @@ def parse_tools(result: dict[str, Any]) -> list[ToolDef]:
     return parsed
 
 
-def _post_json(url: str, payload: dict[str, Any], headers: dict[str, str]) -> dict[str, Any]:
+def _json_rpc_headers(headers: dict[str, str]) -> dict[str, str]:
+    # Some MCP servers require clients to accept both JSON and SSE responses.
+    return {
+        "Content-Type": "application/json",
+        "Accept": "application/json, text/event-stream",
+        **headers,
+    }
+
+
+def _post_json(
+    pool: HttpConnectionPool, payload: dict[str, Any], headers: dict[str, str], timeout: float | None = None
+) -> dict[str, Any]:
     body = json.dumps(payload).encode("utf-8")
-    request = urllib.request.Request(url, data=body, method="POST")
-    request.add_header("Content-Type", "application/json")
-    request.add_header("Accept", "application/json, text/event-stream")
-    for key, value in headers.items():
-        request.add_header(key, value)
-    try:
-        with urllib.request.urlopen(request, timeout=30) as response:
-            content = response.read().decode("utf-8")
-    except urllib.error.HTTPError as exc:
-        error_body = exc.read().decode("utf-8")
-        raise MCPError(f"HTTP error {exc.code}: {error_body}") from exc
+    with pool.post(body, _json_rpc_headers(headers), timeout) as response:
+        content = response.read().decode("utf-8")
+        if response.status >= 400:
+            raise MCPError(f"HTTP error {response.status}: {content}")
     try:
         return json.loads(content)
     except json.JSONDecodeError as exc:
         raise MCPError("Invalid JSON response from MCP server") from exc
 
 
-def _post_sse(url: str, payload: dict[str, Any], headers: dict[str, str]) -> dict[str, Any]:
+def _post_sse(
+    pool: HttpConnectionPool,
+    payload: dict[str, Any],
+    headers: dict[str, str],
+    request_id: int,
+    on_notification: NotificationHandler,
+    timeout: float | None = None,
+) -> dict[str, Any]:
+    """POST a request and read the SSE stream until the response for ``request_id`` arrives.
+
+    Events are parsed as they arrive; notifications seen before the response are passed
+    to ``on_notification``. The stream is abandoned once the response is found, or with
+    ``TimeoutError`` once ``timeout`` seconds have passed (progress events do not extend it).
+    """
+    deadline = time.monotonic() + timeout if timeout else None
     body = json.dumps(payload).encode("utf-8")
-    request = urllib.request.Request(url, data=body, method="POST")
-    request.add_header("Content-Type", "application/json")
-    # Some MCP servers require clients to accept both JSON and SSE responses.
-    request.add_header("Accept", "application/json, text/event-stream")
-    for key, value in headers.items():
-        request.add_header(key, value)
-    try:
-        with urllib.request.urlopen(request, timeout=30) as response:
-            raw = response.read()
-            return _parse_sse_payload(raw)
-    except urllib.error.HTTPError as exc:
-        error_body = exc.read().decode("utf-8")
-        raise MCPError(f"HTTP error {exc.code}: {error_body}") from exc
+    with pool.post(body, _json_rpc_headers(headers), timeout) as response:
+        if response.status >= 400:
+            error_body = response.read().decode("utf-8", errors="replace")
+            raise MCPError(f"HTTP error {response.status}: {error_body}")
+        content_type = response.getheader("Content-Type") or ""
+        if "text/event-stream" not in content_type:
+            content = response.read().decode("utf-8", errors="replace")
+            try:
+                return json.loads(content)
+            except json.JSONDecodeError as exc:
+                raise MCPError("Invalid JSON response from MCP server") from exc
+        for event in iter_sse_events(response):
+            message = _match_sse_event(event, request_id, on_notification)
+            if message is not None:
+                return message
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError
+    raise MCPError("No JSON response received from SSE stream")
 
 
-def _parse_sse_payload(raw: bytes) -> dict[str, Any]:
-    text = raw.decode("utf-8", errors="replace")
-    for line in text.splitlines():
-        line = line.strip()
-        if not line or not line.startswith("data:"):
-            continue
-        payload = line.replace("data:", "", 1).strip()
-        if payload in {"[DONE]", ""}:
-            continue
-        try:
-            return json.loads(payload)
-        except json.JSONDecodeError:
-            continue
+@dataclass
+class SSEEvent:
+    event: str
+    data: str
+    id: str | None = None
+
+
+class SSEDecoder:
+    """Incremental Server-Sent Events parser: feed lines, receive each event once complete."""
+
+    def __init__(self) -> None:
+        self._event = ""
+        self._data: list[str] = []
+        self._id: str | None = None
+
+    def feed(self, line: str) -> SSEEvent | None:
+        line = line.rstrip("\r\n")
+        if not line:
+            return self.flush()
+        if line.startswith(":"):
+            return None
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            self._data.append(value)
+        elif field == "event":
+            self._event = value
+        elif field == "id":
+            self._id = value
+        return None
+
+    def flush(self) -> SSEEvent | None:
+        data, event, event_id = self._data, self._event, self._id
+        self._data, self._event = [], ""
+        if not data:
+            return None
+        return SSEEvent(event=event or "message", data="\n".join(data), id=event_id)
+
+
+def iter_sse_events(lines: Iterable[bytes]) -> Iterator[SSEEvent]:
+    decoder = SSEDecoder()
+    for raw_line in lines:
+        event = decoder.feed(raw_line.decode("utf-8", errors="replace"))
+        if event is not None:
+            yield event
+    event = decoder.flush()
+    if event is not None:
+        yield event
+
+
+def _match_sse_event(
+    event: SSEEvent,
+    request_id: int,
+    on_notification: NotificationHandler,
+) -> dict[str, Any] | None:
+    """Return the event's message if it is the response to ``request_id``; forward notifications."""
+    message = _decode_sse_message(event.data)
+    if message is None:
+        return None
+    if "method" in message:
+        if "id" not in message:
+            on_notification(message)
+        return None
+    if message.get("id") == request_id:
+        return message
+    return None
+
+
+async def aiter_sse_events(lines: AsyncIterator[str]) -> AsyncIterator[SSEEvent]:
+    decoder = SSEDecoder()
+    async for line in lines:
+        event = decoder.feed(line)
+        if event is not None:
+            yield event
+    event = decoder.flush()
+    if event is not None:
+        yield event
+
+
+def _unwrap_response(response: dict[str, Any], request_id: int) -> Any:
+    if response.get("id") != request_id:
+        raise MCPError("mismatched response id")
+    if "error" in response:
+        raise MCPError(response["error"])
+    return response.get("result")
+
+
+def _decode_sse_message(data: str) -> dict[str, Any] | None:
+    data = data.strip()
+    if data in {"[DONE]", ""}:
+        return None
     try:
-        return json.loads(text)
-    except json.JSONDecodeError as exc:
-        raise MCPError("No JSON response received from SSE stream") from exc
+        message = json.loads(data)
+    except json.JSONDecodeError:
+        return None
+    return message if isinstance(message, dict) else None
 
 
 def load_mcp_settings_data(raw: dict[str, Any]) -> list[ServerConfig]:
@@ -494,7 +2029,10 @@ def parse_description_value(raw: str) -> str:
 def read_frontmatter_description(skill_path: Path) -> str | None:
     if not skill_path.exists():
         return None
-    content = skill_path.read_text()
+    return parse_frontmatter_description(skill_path.read_text())
+
+
+def parse_frontmatter_description(content: str) -> str | None:
     match = re.match(r"(?s)^---\n(.*?)\n---\n", content)
     if not match:
         return None
@@ -526,37 +2064,240 @@ def load_lock(path: Path) -> dict[str, Any] | None:
     return data
 
 
-def write_lock(path: Path, hash_value: str) -> None:
-    payload = {"hash": hash_value}
+def write_lock(path: Path, hash_value: str, skills: Mapping[str, Any] | None = None) -> None:
+    payload: dict[str, Any] = {"hash": hash_value}
+    if skills is not None:
+        payload["skills"] = dict(sorted(skills.items()))
     path.write_text(json.dumps(payload, indent=2, ensure_ascii=True))
 
 
-def gather_tools(manager: MCPManager, server_ids: Iterable[str]) -> dict[str, list[ToolDef]]:
+def gather_tools(
+    manager: MCPManager,
+    server_ids: Iterable[str],
+    on_result: ServerSyncHandler | None = None,
+) -> dict[str, list[ToolDef]]:
+    """List tools on all servers concurrently.
+
+    Each server gets its own ``discovery_timeout_seconds`` deadline; servers that fail or
+    time out are logged and left out. Each result is logged and passed to ``on_result``
+    as soon as that server finishes; a timed-out server that finishes later is reported
+    to ``on_result`` again then.
+    """
+    server_ids = list(server_ids)
     tools_by_server: dict[str, list[ToolDef]] = {}
-    for server_id in server_ids:
+    if not server_ids:
+        return tools_by_server
+    executor = ThreadPoolExecutor(max_workers=len(server_ids), thread_name_prefix="tools-list")
+    started = time.monotonic()
+    futures = {executor.submit(manager.list_tools, server_id): server_id for server_id in server_ids}
+    deadlines = {
+        future: started + manager.get_config(server_id).discovery_timeout_seconds
+        for future, server_id in futures.items()
+    }
+    pending = set(futures)
+
+    def report_late(future: Future[list[ToolDef]]) -> None:
+        server_id = futures[future]
         try:
-            tools_by_server[server_id] = manager.list_tools(server_id)
+            tools = future.result()
         except Exception as exc:
             LOGGER.error(f"tools_list_failed, for server_id={server_id}: {exc}")
+            error: Exception | None = exc
+            tools = None
+        else:
+            LOGGER.info(
+                f"tools_list_ready_late, for server_id={server_id}: {len(tools)} tools "
+                f"in {time.monotonic() - started:.1f}s"
+            )
+            error = None
+        if on_result is not None:
+            on_result(server_id, tools, error)
+
+    try:
+        while pending:
+            now = time.monotonic()
+            for future in [future for future in pending if deadlines[future] <= now]:
+                pending.discard(future)
+                LOGGER.error(f"tools_list_timed_out, for server_id={futures[future]}")
+                if on_result is not None:
+                    on_result(futures[future], None, MCPError("tools/list timed out"))
+                future.add_done_callback(report_late)
+            if not pending:
+                break
+            done, pending = wait(
+                pending,
+                timeout=min(deadlines[future] for future in pending) - now,
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                server_id = futures[future]
+                try:
+                    tools_by_server[server_id] = future.result()
+                except Exception as exc:
+                    LOGGER.error(f"tools_list_failed, for server_id={server_id}: {exc}")
+                    if on_result is not None:
+                        on_result(server_id, None, exc)
+                    continue
+                if on_result is not None:
+                    on_result(server_id, tools_by_server[server_id], None)
+                LOGGER.info(
+                    f"tools_list_ready, for server_id={server_id}: {len(tools_by_server[server_id])} tools "
+                    f"in {time.monotonic() - started:.1f}s ({len(tools_by_server)}/{len(server_ids)} servers)"
+                )
+    finally:
+        # Timed-out servers keep starting in the background and stay usable for later calls.
+        executor.shutdown(wait=False)
+    return tools_by_server
+
+
+def server_config_hash(config: ServerConfig) -> str:
+    """Hash the parts of a server config that can change its tool list.
+
+    Only env and header names are included so secrets never reach the cache file;
+    version pins are part of ``command``/``args``.
+    """
+    identity = {
+        "command": config.command,
+        "args": config.args,
+        "env": sorted(config.env),
+        "url": config.url,
+        "transport": resolve_transport(config),
+        "headers": sorted(config.headers),
+    }
+    raw = json.dumps(identity, ensure_ascii=True, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def load_tools_cache(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text())
+    except json.JSONDecodeError:
+        LOGGER.warning("invalid_mcp_tools_cache", extra={"path": str(path)})
+        return {}
+    servers = data.get("servers") if isinstance(data, dict) else None
+    return servers if isinstance(servers, dict) else {}
+
+
+def write_tools_cache(path: Path, servers: Mapping[str, Any]) -> None:
+    payload = {"servers": dict(sorted(servers.items()))}
+    path.write_text(json.dumps(payload, indent=2, ensure_ascii=True))
+
+
+def cached_tools(
+    cache: Mapping[str, Any],
+    config: ServerConfig,
+    ttl_seconds: float,
+    now: float,
+) -> list[ToolDef] | None:
+    entry = cache.get(config.id)
+    if not isinstance(entry, dict) or entry.get("hash") != server_config_hash(config):
+        return None
+    fetched_at = entry.get("fetched_at")
+    if not isinstance(fetched_at, (int, float)) or now - fetched_at > ttl_seconds:
+        return None
+    tools = entry.get("tools")
+    if not isinstance(tools, list):
+        return None
+    return parse_tools({"tools": tools})
+
+
+def tools_cache_entry(config: ServerConfig, tools: list[ToolDef], now: float) -> dict[str, Any]:
+    return {
+        "hash": server_config_hash(config),
+        "fetched_at": now,
+        "tools": [
+            {"name": tool.name, "description": tool.description, "inputSchema": tool.input_schema}
+            for tool in tools
+        ],
+    }
+
+
+def gather_tools_cached(
+    manager: MCPManager,
+    configs: list[ServerConfig],
+    cache_path: Path,
+    ttl_seconds: float,
+    force_refresh: bool,
+    on_result: ServerSyncHandler | None = None,
+) -> dict[str, list[ToolDef]]:
+    """Resolve tool lists from the on-disk cache, discovering only stale or changed servers.
+
+    Servers served from the cache are not started here; MCPManager starts them lazily on
+    their first call.
+    """
+    now = time.time()
+    cache = {} if force_refresh or ttl_seconds <= 0 else load_tools_cache(cache_path)
+    tools_by_server: dict[str, list[ToolDef]] = {}
+    stale_ids: list[str] = []
+    for config in configs:
+        tools = cached_tools(cache, config, ttl_seconds, now)
+        if tools is None:
+            stale_ids.append(config.id)
+        else:
+            tools_by_server[config.id] = tools
+            manager.set_known_tools(config.id, tools)
+            if on_result is not None:
+                on_result(config.id, tools, None)
+    if tools_by_server:
+        LOGGER.info(f"tools_cache_hit for server_id(s)={', '.join(sorted(tools_by_server))}")
+    tools_by_server.update(gather_tools(manager, stale_ids, on_result))
+
+    configs_by_id = {config.id: config for config in configs}
+    updated = {server_id: entry for server_id, entry in cache.items() if server_id in configs_by_id}
+    for server_id in stale_ids:
+        if server_id in tools_by_server:
+            updated[server_id] = tools_cache_entry(configs_by_id[server_id], tools_by_server[server_id], now)
+    if ttl_seconds > 0 and (stale_ids or updated.keys() != cache.keys()):
+        write_tools_cache(cache_path, updated)
     return tools_by_server
 
 
+def _manifest_matches_stat(manifest_entry: Any, stat: os.stat_result) -> bool:
+    return (
+        isinstance(manifest_entry, dict)
+        and "description" in manifest_entry
+        and manifest_entry.get("mtime_ns") == stat.st_mtime_ns
+        and manifest_entry.get("size") == stat.st_size
+    )
+
+
+def existing_skill_description(skill_path: Path, manifest_entry: Any) -> str | None:
+    """Description in an existing SKILL.md, read from the manifest while the file is unchanged.
+
+    Only a ``stat`` is needed when mtime and size still match the manifest; otherwise the
+    file is read and parsed.
+    """
+    try:
+        stat = skill_path.stat()
+    except FileNotFoundError:
+        return None
+    if _manifest_matches_stat(manifest_entry, stat):
+        return manifest_entry["description"]
+    return read_frontmatter_description(skill_path)
+
+
 def build_skill_entries(
     output_dir: Path,
     tools_by_server: dict[str, list[ToolDef]],
     description_overrides: Mapping[str, str] | None = None,
+    manifest: Mapping[str, Any] | None = None,
+    base_dir: Path | None = None,
 ) -> list[SkillEntry]:
     entries: list[SkillEntry] = []
     overrides = description_overrides or {}
+    previous = manifest or {}
     for server_id in sorted(tools_by_server.keys()):
         tools = sorted(tools_by_server[server_id], key=lambda tool: tool.name)
         for tool in tools:
             tool_path = skill_dir(output_dir, server_id, tool.name)
             skill_path = tool_path / "SKILL.md"
             skill_name = tool_path.name
-            existing_description = read_frontmatter_description(skill_path)
-            override_description = overrides.get(skill_name)
-            description = override_description or existing_description or None
+            description = overrides.get(skill_name)
+            if not description:
+                key = skill_manifest_key(skill_path, base_dir) if base_dir else str(skill_path)
+                description = existing_skill_description(skill_path, previous.get(key)) or None
             entries.append(
                 SkillEntry(
                     name=tool.name,
@@ -567,13 +2308,17 @@ def build_skill_entries(
     return entries
 
 
+def skill_manifest_key(path: Path, base_dir: Path) -> str:
+    try:
+        return str(path.relative_to(base_dir))
+    except ValueError:
+        return str(path)
+
+
 def compute_skills_hash(entries: list[SkillEntry], base_dir: Path) -> str:
     payload: list[dict[str, str]] = []
     for entry in sorted(entries, key=lambda item: (item.name, str(item.path))):
-        try:
-            path_value = str(entry.path.relative_to(base_dir))
-        except ValueError:
-            path_value = str(entry.path)
+        path_value = skill_manifest_key(entry.path, base_dir)
         payload.append({"name": entry.name, "path": path_value, "content": entry.content})
     raw = json.dumps(payload, ensure_ascii=True, sort_keys=True).encode("utf-8")
     return hashlib.sha256(raw).hexdigest()
@@ -582,34 +2327,95 @@ def compute_skills_hash(entries: list[SkillEntry], base_dir: Path) -> str:
 def write_skills(
     entries: list[SkillEntry],
     force_refresh: bool,
-) -> None:
+    manifest: Mapping[str, Any] | None = None,
+    base_dir: Path | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Write only the SKILL.md files whose content hash differs from ``manifest``.
+
+    ``manifest`` maps skill paths (relative to ``base_dir``) to the content hash, frontmatter
+    description and file mtime/size from the previous run. Missing files are always
+    written. Returns the manifest for ``entries``.
+    """
+    previous = manifest or {}
+    updated: dict[str, dict[str, Any]] = {}
+    written = 0
     for entry in entries:
-        tool_path = entry.path.parent
-        if tool_path.exists() and not force_refresh:
-            continue
-        tool_path.mkdir(parents=True, exist_ok=True)
-        entry.path.write_text(entry.content)
+        key = skill_manifest_key(entry.path, base_dir) if base_dir else str(entry.path)
+        content_hash = hashlib.sha256(entry.content.encode("utf-8")).hexdigest()
+        previous_entry = previous.get(key)
+        unchanged = isinstance(previous_entry, dict) and previous_entry.get("hash") == content_hash
+        if unchanged and not force_refresh and entry.path.exists():
+            stat = entry.path.stat()
+            if _manifest_matches_stat(previous_entry, stat):
+                description = previous_entry["description"]
+            else:
+                description = read_frontmatter_description(entry.path)
+        else:
+            entry.path.parent.mkdir(parents=True, exist_ok=True)
+            entry.path.write_text(entry.content)
+            written += 1
+            stat = entry.path.stat()
+            description = parse_frontmatter_description(entry.content)
+        updated[key] = {
+            "hash": content_hash,
+            "description": description,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+    if written:
+        LOGGER.info(f"skills_written: {written} of {len(entries)}")
+    return updated
 
 
-def get_all_skill_dirs(
-    mcp_skills_dir: Path,
-    server_id: str,
-    include_symlinks: bool = False,
-) -> list[Path]:
-    """Get all skill directories (or symlinks) for a given server."""
-    if not mcp_skills_dir.exists():
-        return []
+def skill_prefix(server_id: str) -> str:
     # Convert server_id to kebab-case first (e.g., backgroundProcess -> background-process)
-    kebab_server_id = camel_to_kebab(server_id)
-    pattern = f"{slugify(kebab_server_id)}-*"
-    matches: list[Path] = []
-    for path in mcp_skills_dir.glob(pattern):
-        if path.is_dir():
-            matches.append(path)
-            continue
-        if include_symlinks and path.is_symlink():
-            matches.append(path)
-    return sorted(matches)
+    return f"{slugify(camel_to_kebab(server_id))}-"
+
+
+@dataclass(frozen=True)
+class SkillDirEntry:
+    name: str
+    path: Path
+    is_dir: bool
+    is_symlink: bool
+    link_target: Path | None = None
+
+
+class SkillDirIndex:
+    """Snapshot of one skills directory taken with a single ``os.scandir`` pass.
+
+    Entry types and symlink targets are read once here, so per-server lookups do not
+    touch the filesystem again.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._entries: dict[str, SkillDirEntry] = {}
+        try:
+            with os.scandir(root) as scanner:
+                for item in scanner:
+                    is_symlink = item.is_symlink()
+                    self._entries[item.name] = SkillDirEntry(
+                        name=item.name,
+                        path=root / item.name,
+                        is_dir=item.is_dir(),
+                        is_symlink=is_symlink,
+                        link_target=Path(os.readlink(item.path)) if is_symlink else None,
+                    )
+        except FileNotFoundError:
+            pass
+
+    def get(self, name: str) -> SkillDirEntry | None:
+        return self._entries.get(name)
+
+    def for_server(self, server_id: str, include_symlinks: bool = False) -> list[SkillDirEntry]:
+        """Entries named ``<server-slug>-*``: directories, plus dangling symlinks if requested."""
+        prefix = skill_prefix(server_id)
+        return [
+            entry
+            for name, entry in sorted(self._entries.items())
+            if name.startswith(prefix) and (entry.is_dir or (include_symlinks and entry.is_symlink))
+        ]
 
 
 def build_expected_skill_names(
@@ -636,16 +2442,20 @@ def prune_mcp_skills(
     mcp_skills_dir: Path,
     expected_skill_names: dict[str, set[str]],
     disabled_servers: set[str],
+    index: SkillDirIndex | None = None,
 ) -> None:
+    index = index or SkillDirIndex(mcp_skills_dir)
+    # Server prefixes can overlap (e.g. "dart" and "dart-tools"); never drop another server's skill.
+    all_expected = set().union(*expected_skill_names.values())
     for server_id in disabled_servers:
-        for skill_path in get_all_skill_dirs(mcp_skills_dir, server_id):
-            remove_skill_path(skill_path)
+        for entry in index.for_server(server_id):
+            if entry.name not in all_expected:
+                remove_skill_path(entry.path)
 
-    for server_id, expected_names in expected_skill_names.items():
-        existing_paths = get_all_skill_dirs(mcp_skills_dir, server_id)
-        for skill_path in existing_paths:
-            if skill_path.name not in expected_names:
-                remove_skill_path(skill_path)
+    for server_id in expected_skill_names:
+        for entry in index.for_server(server_id):
+            if entry.name not in all_expected:
+                remove_skill_path(entry.path)
 
 
 def manage_symlinks(
@@ -653,6 +2463,7 @@ def manage_symlinks(
     skills_dir: Path,
     expected_skill_names: dict[str, set[str]],
     disabled_servers: set[str],
+    index: SkillDirIndex | None = None,
 ) -> None:
     """
     Manage symlinks from skills_dir to mcp_skills_dir.
@@ -660,64 +2471,272 @@ def manage_symlinks(
     - Remove symlinks for disabled servers
     - Remove symlinks for removed tools on enabled servers
     - Symlinks are relative paths
+
+    The current state comes from one scan of skills_dir; only the difference between it
+    and the expected links is applied.
     """
     skills_dir.mkdir(parents=True, exist_ok=True)
+    index = index or SkillDirIndex(skills_dir)
+    all_expected = set().union(*expected_skill_names.values())
 
-    # Create symlinks for enabled servers
+    to_remove: list[Path] = []
+    to_create: dict[Path, Path] = {}
     for server_id, skill_names in expected_skill_names.items():
         for skill_name in sorted(skill_names):
-            symlink_path = skills_dir / skill_name
-
             # Create relative symlink: ../mcp-skills/<skill-name>
             relative_target = Path("..") / "mcp-skills" / skill_name
-
-            if symlink_path.exists() or symlink_path.is_symlink():
-                # Check if it's already the correct symlink
-                if symlink_path.is_symlink() and symlink_path.readlink() == relative_target:
+            entry = index.get(skill_name)
+            if entry is not None:
+                if entry.is_symlink and entry.link_target == relative_target:
                     continue
                 # Remove old symlink or file; avoid unlinking directories.
-                if symlink_path.is_symlink() or symlink_path.is_file():
-                    symlink_path.unlink()
-                else:
+                if entry.is_dir and not entry.is_symlink:
                     LOGGER.warning(
                         "symlink_path_exists_not_removed",
-                        extra={"path": str(symlink_path)},
+                        extra={"path": str(entry.path)},
                     )
                     continue
+                to_remove.append(entry.path)
+            to_create[skills_dir / skill_name] = relative_target
 
-            symlink_path.symlink_to(relative_target)
-            LOGGER.debug(f"Created symlink: {symlink_path} -> {relative_target}")
-
-    # Remove symlinks for tools removed from enabled servers
-    for server_id, skill_names in expected_skill_names.items():
-        skill_dirs = get_all_skill_dirs(skills_dir, server_id, include_symlinks=True)
-        for skill_path in skill_dirs:
-            if skill_path.name in skill_names:
-                continue
-            if skill_path.is_symlink() or skill_path.is_file():
-                skill_path.unlink()
-                LOGGER.debug(f"Removed stale symlink: {skill_path}")
+        # Remove symlinks for tools removed from enabled servers
+        for entry in index.for_server(server_id, include_symlinks=True):
+            if entry.name not in all_expected and entry.is_symlink:
+                to_remove.append(entry.path)
 
     # Remove symlinks for disabled servers
     for server_id in disabled_servers:
-        skill_dirs = get_all_skill_dirs(skills_dir, server_id, include_symlinks=True)
-        for skill_path in skill_dirs:
-            skill_name = skill_path.name
-            symlink_path = skills_dir / skill_name
+        for entry in index.for_server(server_id, include_symlinks=True):
+            if entry.name not in all_expected and entry.is_symlink:
+                to_remove.append(entry.path)
+
+    for path in to_remove:
+        path.unlink(missing_ok=True)
+        LOGGER.debug(f"Removed symlink: {path}")
+    for symlink_path, relative_target in to_create.items():
+        symlink_path.symlink_to(relative_target)
+        LOGGER.debug(f"Created symlink: {symlink_path} -> {relative_target}")
+
 
-            if symlink_path.is_symlink():
-                symlink_path.unlink()
-                LOGGER.debug(f"Removed symlink: {symlink_path}")
+def canonical_call_key(
+    server_id: str,
+    tool_name: str,
+    arguments: Mapping[str, Any] | None,
+    session_key: str | None = None,
+) -> str:
+    raw = json.dumps(
+        [server_id, tool_name, arguments or {}, session_key],
+        ensure_ascii=True,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """LRU cache of tool results bounded by their encoded size, optionally persisted to sqlite.
+
+    Values are stored JSON-encoded, so every hit returns a fresh copy. With a ``path``,
+    entries survive restarts; the database is bounded by the same ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_RESULT_CACHE_MAX_BYTES, path: Path | None = None) -> None:
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, expires_at REAL, size INTEGER, value TEXT)"
+            )
+            self._db.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        now = time.time()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT expires_at, value FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    cached = (row[0], row[1])
+                    self._store(key, cached)
+            if cached is None:
+                return False, None
+            expires_at, encoded = cached
+            if expires_at <= now:
+                self._evict(key)
+                return False, None
+            self._entries.move_to_end(key)
+        return True, json.loads(encoded)
+
+    def put(self, key: str, value: Any, ttl_seconds: float) -> None:
+        encoded = json.dumps(value, ensure_ascii=True)
+        if len(encoded) > self._max_bytes:
+            return
+        expires_at = time.time() + ttl_seconds
+        with self._lock:
+            self._store(key, (expires_at, encoded))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, expires_at, size, value) VALUES (?, ?, ?, ?)",
+                    (key, expires_at, len(encoded), encoded),
+                )
+                self._trim_db()
+                self._db.commit()
+
+    def _store(self, key: str, cached: tuple[float, str]) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous[1])
+        self._entries[key] = cached
+        self._size += len(cached[1])
+        while self._size > self._max_bytes and self._entries:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _evict(self, key: str) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous[1])
+        if self._db is not None:
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._db.commit()
+
+    def _trim_db(self) -> None:
+        assert self._db is not None
+        self._db.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        # Drop the entries closest to expiry until the database fits again.
+        for key, size in self._db.execute("SELECT key, size FROM results ORDER BY expires_at").fetchall():
+            if total <= self._max_bytes:
+                break
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# Methods that never change server state, coalesced by default.
+READ_ONLY_METHODS = frozenset({"tools/list", "resources/list", "resources/read", "prompts/list", "prompts/get"})
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers that use the same key.
+
+    The first caller (the leader) runs the call; callers arriving while it is in flight
+    wait for and receive the leader's result or exception. Nothing is kept afterwards.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future[Any]] = {}
+
+    def _join(self, key: str) -> tuple[Future[Any], bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _finish(self, key: str, future: Future[Any], result: Any, exc: BaseException | None) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+        if future.done():
+            return
+        if exc is None:
+            future.set_result(result)
+        elif isinstance(exc, Exception):
+            future.set_exception(exc)
+        else:
+            # Do not propagate the leader's cancellation or interrupt to the other callers.
+            future.set_exception(MCPError("coalesced request was cancelled"))
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._finish(key, future, None, exc)
+            raise
+        self._finish(key, future, result, None)
+        return result
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future, leader = self._join(key)
+        if not leader:
+            # Shielded so a cancelled follower does not cancel the future shared with the others.
+            return await asyncio.shield(asyncio.wrap_future(future))
+        try:
+            result = await fn()
+        except BaseException as exc:
+            self._finish(key, future, None, exc)
+            raise
+        self._finish(key, future, result, None)
+        return result
+
+
+MAX_BATCH_SIZE = 100
+
+
+def _decode_request_json(json_str: str) -> dict[str, Any] | list[Any]:
+    try:
+        payload = json.loads(json_str)
+    except json.JSONDecodeError:
+        raise MCPError("invalid_json") from None
+    if isinstance(payload, list):
+        if not payload:
+            raise MCPError("batch must not be empty")
+        if len(payload) > MAX_BATCH_SIZE:
+            raise MCPError(f"batch exceeds {MAX_BATCH_SIZE} requests")
+        return payload
+    if not isinstance(payload, dict):
+        raise MCPError("payload must be object")
+    return payload
+
+
+def _error_json(detail: str) -> str:
+    return json.dumps({"status": "error", "detail": detail}, ensure_ascii=True)
+
+
+@dataclass(frozen=True)
+class BridgeCall:
+    server_id: str
+    tool_name: str | None = None
+    method: str | None = None
+    arguments: dict[str, Any] | None = None
+    session_key: str | None = None
 
 
 @dataclass
 class Bridge:
     manager: MCPManager
+    result_cache: ResultCache | None = None
+    single_flight: SingleFlight = field(default_factory=SingleFlight)
 
-    def handle_request(self, payload: dict[str, Any]) -> dict[str, Any]:
+    def parse_request(self, payload: dict[str, Any]) -> BridgeCall:
         server_id = payload.get("server_id")
         if not isinstance(server_id, str) or not server_id:
             raise MCPError("request missing server_id, this is a skill to mcp tool bridge, please use the best agent skill with server_id instead of calling mcp tool directly")
+        session_key = payload.get("session_key")
+        if session_key is not None and not isinstance(session_key, str):
+            raise MCPError("session_key must be a string")
         if "tool_name" in payload:
             tool_name = payload.get("tool_name")
             if not isinstance(tool_name, str) or not tool_name:
@@ -725,8 +2744,9 @@ class Bridge:
             arguments = payload.get("arguments")
             if arguments is not None and not isinstance(arguments, dict):
                 raise MCPError("arguments must be an object")
-            result = self.manager.call_tool(server_id, tool_name, arguments)
-            return {"status": "ok", "result": result}
+            return BridgeCall(
+                server_id=server_id, tool_name=tool_name, arguments=arguments, session_key=session_key
+            )
         if "method" in payload:
             method = payload.get("method")
             if not isinstance(method, str) or not method:
@@ -734,22 +2754,161 @@ class Bridge:
             params = payload.get("params")
             if params is not None and not isinstance(params, dict):
                 raise MCPError("params must be an object")
-            result = self.manager.request(server_id, method, params)
-            return {"status": "ok", "result": result}
+            return BridgeCall(server_id=server_id, method=method, arguments=params, session_key=session_key)
         raise MCPError("request must include tool_name or method")
 
-    def handle_request_json(self, json_str: str) -> str:
+    def _cache_policy(self, call: BridgeCall) -> tuple[str, float] | None:
+        """Return the (cache key, ttl) for a cacheable tool call, or None."""
+        if self.result_cache is None or call.tool_name is None:
+            return None
+        try:
+            ttl = self.manager.get_config(call.server_id).cacheable_tools.get(call.tool_name)
+        except MCPError:
+            return None
+        if not ttl or ttl <= 0:
+            return None
+        return canonical_call_key(call.server_id, call.tool_name, call.arguments, call.session_key), ttl
+
+    def _store_result(self, policy: tuple[str, float] | None, result: Any) -> None:
+        if policy is None or self.result_cache is None:
+            return
+        if isinstance(result, dict) and result.get("isError"):
+            return
+        key, ttl = policy
+        self.result_cache.put(key, result, ttl)
+
+    def _cached_result(self, policy: tuple[str, float] | None) -> tuple[bool, Any]:
+        if policy is None or self.result_cache is None:
+            return False, None
+        return self.result_cache.get(policy[0])
+
+    def _flight_key(self, call: BridgeCall) -> str | None:
+        try:
+            config = self.manager.get_config(call.server_id)
+        except MCPError:
+            return None
+        if config.single_flight is None:
+            # Tools may have side effects (clicks, process starts); only merge known-safe calls.
+            if call.tool_name is not None:
+                coalesce = call.tool_name in config.cacheable_tools
+            else:
+                coalesce = call.method in READ_ONLY_METHODS
+        else:
+            coalesce = config.single_flight
+        if not coalesce:
+            return None
+        name = call.tool_name if call.tool_name is not None else f"method:{call.method}"
+        return canonical_call_key(call.server_id, name, call.arguments, call.session_key)
+
+    def _call_upstream(self, call: BridgeCall, policy: tuple[str, float] | None) -> Any:
+        token = SESSION_KEY.set(call.session_key)
+        try:
+            if call.tool_name is not None:
+                result = self.manager.call_tool(call.server_id, call.tool_name, call.arguments)
+            else:
+                result = self.manager.request(call.server_id, call.method or "", call.arguments)
+        finally:
+            SESSION_KEY.reset(token)
+        self._store_result(policy, result)
+        return result
+
+    async def _call_upstream_async(self, call: BridgeCall, policy: tuple[str, float] | None) -> Any:
+        token = SESSION_KEY.set(call.session_key)
+        try:
+            if call.tool_name is not None:
+                result = await self.manager.call_tool_async(call.server_id, call.tool_name, call.arguments)
+            else:
+                result = await self.manager.request_async(call.server_id, call.method or "", call.arguments)
+        finally:
+            SESSION_KEY.reset(token)
+        self._store_result(policy, result)
+        return result
+
+    def handle_request(self, payload: dict[str, Any]) -> dict[str, Any]:
+        call = self.parse_request(payload)
+        with trace_span("request", server=call.server_id, tool=call.tool_name or call.method) as span:
+            policy = self._cache_policy(call)
+            hit, result = self._cached_result(policy)
+            span["cache_hit"] = hit
+            if not hit:
+                flight_key = self._flight_key(call)
+                if flight_key is None:
+                    result = self._call_upstream(call, policy)
+                else:
+                    result = self.single_flight.do(flight_key, lambda: self._call_upstream(call, policy))
+        return {"status": "ok", "result": result}
+
+    async def handle_request_async(self, payload: dict[str, Any]) -> dict[str, Any]:
+        call = self.parse_request(payload)
+        with trace_span("request", server=call.server_id, tool=call.tool_name or call.method) as span:
+            policy = self._cache_policy(call)
+            hit, result = self._cached_result(policy)
+            span["cache_hit"] = hit
+            if not hit:
+                flight_key = self._flight_key(call)
+                if flight_key is None:
+                    result = await self._call_upstream_async(call, policy)
+                else:
+                    result = await self.single_flight.do_async(
+                        flight_key, lambda: self._call_upstream_async(call, policy)
+                    )
+        return {"status": "ok", "result": result}
+
+    def _handle_item(self, payload: Any) -> dict[str, Any]:
         try:
-            payload = json.loads(json_str)
-        except json.JSONDecodeError:
-            return json.dumps({"status": "error", "detail": "invalid_json"}, ensure_ascii=True)
-        if not isinstance(payload, dict):
-            return json.dumps({"status": "error", "detail": "payload must be object"}, ensure_ascii=True)
+            if not isinstance(payload, dict):
+                raise MCPError("payload must be object")
+            with trace_call():
+                return self.handle_request(payload)
+        except Exception as exc:
+            return {"status": "error", "detail": str(exc)}
+
+    async def _handle_item_async(self, payload: Any) -> dict[str, Any]:
         try:
-            response = self.handle_request(payload)
+            if not isinstance(payload, dict):
+                raise MCPError("payload must be object")
+            with trace_call():
+                return await self.handle_request_async(payload)
         except Exception as exc:
-            return json.dumps({"status": "error", "detail": str(exc)}, ensure_ascii=True)
-        return json.dumps(response, ensure_ascii=True)
+            return {"status": "error", "detail": str(exc)}
+
+    def handle_batch(self, payloads: list[Any]) -> dict[str, Any]:
+        """Run a batch concurrently; results keep the request order, each with its own status."""
+        with ThreadPoolExecutor(max_workers=min(len(payloads), 16), thread_name_prefix="batch") as executor:
+            results = list(executor.map(self._handle_item, payloads))
+        return {"status": "ok", "results": results}
+
+    async def handle_batch_async(self, payloads: list[Any]) -> dict[str, Any]:
+        results = await asyncio.gather(*(self._handle_item_async(payload) for payload in payloads))
+        return {"status": "ok", "results": list(results)}
+
+    def handle_request_json(self, json_str: str) -> str:
+        with trace_call():
+            try:
+                with trace_span("decode_json", bytes=len(json_str)):
+                    payload = _decode_request_json(json_str)
+                if isinstance(payload, list):
+                    response = self.handle_batch(payload)
+                else:
+                    response = self.handle_request(payload)
+            except Exception as exc:
+                return _error_json(str(exc))
+            with trace_span("encode_json"):
+                return json.dumps(response, ensure_ascii=True)
+
+    async def handle_request_json_async(self, json_str: str) -> str:
+        with trace_call():
+            try:
+                with trace_span("decode_json", bytes=len(json_str)):
+                    payload = _decode_request_json(json_str)
+                if isinstance(payload, list):
+                    response = await self.handle_batch_async(payload)
+                else:
+                    response = await self.handle_request_async(payload)
+            except Exception as exc:
+                return _error_json(str(exc))
+            with trace_span("encode_json"):
+                return json.dumps(response, ensure_ascii=True)
 
 
 def build_bridge(
@@ -759,17 +2918,24 @@ def build_bridge(
     output_dir: Path | None,
     log_level: str,
     description_overrides: Mapping[str, str] | None = None,
+    tools_cache_ttl: float = DEFAULT_TOOLS_CACHE_TTL_SECONDS,
+    manager: MCPManager | None = None,
+    on_server_synced: ServerSyncHandler | None = None,
 ) -> tuple[Bridge, bool]:
     logging.basicConfig(level=log_level.upper(), format="%(levelname)s %(message)s")
     base_dir = Path(__file__).resolve().parents[1]
     output_root = output_dir or base_dir / "mcp-skills"
     skills_dir = base_dir / "skills"
     lock_path = base_dir / LOCK_FILENAME
+    tools_cache_path = base_dir / TOOLS_CACHE_FILENAME
 
     lock_data = load_lock(lock_path)
     lock_hash = None
+    previous_manifest: dict[str, Any] = {}
     if lock_data:
         lock_hash = lock_data.get("hash")
+        if isinstance(lock_data.get("skills"), dict):
+            previous_manifest = lock_data["skills"]
 
     if mcp_settings_data is None:
         raise MCPError("mcp_settings_data is required for build_bridge")
@@ -780,28 +2946,47 @@ def build_bridge(
     enabled_server_ids = {config.id for config in enabled_configs}
     disabled_server_ids = {config.id for config in disabled_configs}
 
-    manager = MCPManager(enabled_configs)
-    server_ids = [config.id for config in enabled_configs]
-
-    tools_by_server = gather_tools(manager, server_ids)
-    entries = build_skill_entries(output_root, tools_by_server, description_overrides)
+    if manager is None:
+        manager = MCPManager(enabled_configs)
+    tools_by_server = gather_tools_cached(
+        manager, enabled_configs, tools_cache_path, tools_cache_ttl, force_refresh, on_server_synced
+    )
+    entries = build_skill_entries(
+        output_root, tools_by_server, description_overrides, previous_manifest, base_dir
+    )
     expected_skill_names = build_expected_skill_names(output_root, tools_by_server)
     skills_hash = compute_skills_hash(entries, base_dir)
 
     lock_changed = skills_hash != lock_hash
-    should_refresh = force_refresh or lock_changed
 
-    write_skills(entries, should_refresh)
-    prune_mcp_skills(output_root, expected_skill_names, disabled_server_ids)
-    manage_symlinks(output_root, skills_dir, expected_skill_names, disabled_server_ids)
+    written_manifest = write_skills(entries, force_refresh, previous_manifest, base_dir)
+    prune_mcp_skills(output_root, expected_skill_names, disabled_server_ids, SkillDirIndex(output_root))
+    manage_symlinks(
+        output_root,
+        skills_dir,
+        expected_skill_names,
+        disabled_server_ids,
+        SkillDirIndex(skills_dir),
+    )
 
-    if lock_changed:
-        write_lock(lock_path, skills_hash)
+    # Keep entries of servers that were not discovered this run; drop pruned skills.
+    manifest = {
+        key: value for key, value in previous_manifest.items() if (base_dir / key).exists()
+    }
+    manifest.update(written_manifest)
+    if lock_changed or manifest != previous_manifest:
+        write_lock(lock_path, skills_hash, manifest)
 
     return Bridge(manager=manager), lock_changed
 
 
 class BridgeSync:
+    """Runs build_bridge in the background while requests are already being served.
+
+    Requests do not wait for the whole sync: the MCPManager exists from ``start()`` on, so
+    a call for one server only waits for that server's client to come up.
+    """
+
     def __init__(
         self,
         *,
@@ -810,32 +2995,60 @@ class BridgeSync:
         output_dir: Path | None,
         log_level: str,
         description_overrides: Mapping[str, str] | None = None,
+        tools_cache_ttl: float = DEFAULT_TOOLS_CACHE_TTL_SECONDS,
+        result_cache: ResultCache | None = None,
+        residency_limits: ResidencyLimits | None = None,
+        metrics: Metrics | None = None,
     ) -> None:
         self._mcp_settings_data = mcp_settings_data
         self._force_refresh = force_refresh
         self._output_dir = output_dir
         self._log_level = log_level
         self._description_overrides = description_overrides
+        self._tools_cache_ttl = tools_cache_ttl
+        self._result_cache = result_cache
+        self._residency_limits = residency_limits
+        self._metrics = metrics
         self._ready = threading.Event()
         self._bridge: Bridge | None = None
         self._lock_changed = False
         self._error: Exception | None = None
-        self._message = "Syncing MCP tools in background. First tool call will wait until ready."
+        self._server_status: dict[str, str] = {}
+        self._status_lock = threading.Lock()
+        self._message = "Syncing MCP tools in background. Each tool call only waits for its own server."
 
     def start(self) -> None:
+        try:
+            configs = load_mcp_settings_data(self._mcp_settings_data)
+        except Exception as exc:
+            self._error = exc
+            self._message = f"Failed to sync MCP tools: {exc}"
+            self._ready.set()
+            return
+        enabled_configs = [config for config in configs if is_server_enabled(config)]
+        manager = MCPManager(enabled_configs, self._residency_limits, self._metrics)
+        self._bridge = Bridge(manager=manager, result_cache=self._result_cache)
+        self._server_status = {config.id: "syncing" for config in enabled_configs}
         thread = threading.Thread(target=self._run, daemon=True)
         thread.start()
 
+    def _on_server_synced(self, server_id: str, tools: list[ToolDef] | None, error: Exception | None) -> None:
+        status = f"ready ({len(tools)} tools)" if tools is not None else f"failed ({error})"
+        with self._status_lock:
+            self._server_status[server_id] = status
+
     def _run(self) -> None:
         try:
-            bridge, lock_changed = build_bridge(
+            _, lock_changed = build_bridge(
                 mcp_settings_data=self._mcp_settings_data,
                 force_refresh=self._force_refresh,
                 output_dir=self._output_dir,
                 log_level=self._log_level,
                 description_overrides=self._description_overrides,
+                tools_cache_ttl=self._tools_cache_ttl,
+                manager=self._bridge.manager if self._bridge else None,
+                on_server_synced=self._on_server_synced,
             )
-            self._bridge = bridge
             self._lock_changed = lock_changed
             if lock_changed:
                 self._message = (
@@ -849,20 +3062,40 @@ class BridgeSync:
         finally:
             self._ready.set()
 
-    def wait_ready(self) -> Bridge:
-        self._ready.wait()
-        if self._error:
-            raise self._error
+    def get_bridge(self) -> Bridge:
+        """Return the bridge without waiting for the sync to finish."""
         if self._bridge is None:
-            raise MCPError("MCP bridge unavailable after sync")
+            if self._error:
+                raise self._error
+            raise MCPError("MCP bridge unavailable, sync has not started")
         return self._bridge
 
+    def get_server_status(self) -> dict[str, str]:
+        with self._status_lock:
+            statuses = dict(self._server_status)
+        if self._bridge is not None:
+            manager = self._bridge.manager
+            statuses = {
+                server_id: f"{status}, {manager.server_state(server_id)}"
+                for server_id, status in statuses.items()
+            }
+        return statuses
+
     def get_message(self) -> str:
-        return self._message
+        statuses = self.get_server_status()
+        if not statuses:
+            return self._message
+        lines = [f"- {server_id}: {status}" for server_id, status in sorted(statuses.items())]
+        return "\n".join([self._message, "MCP servers:", *lines])
 
     def is_ready(self) -> bool:
         return self._ready.is_set()
 
+    async def aclose(self) -> None:
+        """Stop every server client, including the async HTTP clients bound to the server's loop."""
+        if self._bridge is not None:
+            await self._bridge.manager.aclose()
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Dev Swarm MCP Server (stdio)")
@@ -880,6 +3113,76 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Force regeneration of all skill files even if they exist",
     )
+    parser.add_argument(
+        "--tools-cache-ttl",
+        "--tools_cache_ttl",
+        dest="tools_cache_ttl",
+        type=float,
+        default=DEFAULT_TOOLS_CACHE_TTL_SECONDS,
+        help="Seconds a cached tools/list result stays valid (0 disables the cache)",
+    )
+    parser.add_argument(
+        "--result-cache-max-bytes",
+        "--result_cache_max_bytes",
+        dest="result_cache_max_bytes",
+        type=int,
+        default=DEFAULT_RESULT_CACHE_MAX_BYTES,
+        help="Size bound for cached results of tools listed in a server's cacheable_tools",
+    )
+    parser.add_argument(
+        "--result-cache-path",
+        "--result_cache_path",
+        dest="result_cache_path",
+        default=None,
+        help="Optional sqlite file to persist cached tool results across restarts",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        "--idle_timeout",
+        dest="idle_timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT_SECONDS,
+        help="Stop local MCP server processes idle for this many seconds (0 keeps them running)",
+    )
+    parser.add_argument(
+        "--max-resident-servers",
+        "--max_resident_servers",
+        dest="max_resident_servers",
+        type=int,
+        default=0,
+        help="Stop least recently used idle servers beyond this many running ones (0 means no limit)",
+    )
+    parser.add_argument(
+        "--max-resident-memory-mb",
+        "--max_resident_memory_mb",
+        dest="max_resident_memory_mb",
+        type=int,
+        default=0,
+        help="Stop least recently used idle servers while their total RSS exceeds this (0 means no limit)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        "--metrics_port",
+        dest="metrics_port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on http://127.0.0.1:<port>/metrics (0 picks a free port)",
+    )
+    parser.add_argument(
+        "--trace-path",
+        "--trace_path",
+        dest="trace_path",
+        default=None,
+        help="Write timing spans of every bridged call to this file",
+    )
+    parser.add_argument(
+        "--trace-format",
+        "--trace_format",
+        dest="trace_format",
+        choices=["chrome", "jsonl"],
+        default="chrome",
+        help="Trace file format: Chrome trace events (chrome://tracing, Perfetto) or JSONL",
+    )
     return parser.parse_args()
 
 
@@ -949,6 +3252,29 @@ def load_mcp_descriptions(base_dir: Path) -> dict[str, str]:
     return overrides
 
 
+def progress_forwarder(ctx: Context) -> ProgressHandler | None:
+    """Relay upstream progress to the FastMCP caller, if it sent a progress token.
+
+    Progress arrives on client reader threads, so reports are scheduled onto the loop, in
+    the tool call's context so that ``ctx`` still finds its request.
+    """
+    meta = ctx.request_context.meta if ctx.request_context else None
+    if meta is None or meta.progressToken is None:
+        return None
+    loop = asyncio.get_running_loop()
+    call_context = contextvars.copy_context()
+
+    def report(progress: float, total: float | None, message: str | None) -> None:
+        def send() -> None:
+            task = loop.create_task(ctx.report_progress(progress, total, message), context=call_context)
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+
+        loop.call_soon_threadsafe(send)
+
+    return report
+
+
 def main() -> None:
     args = parse_args()
     settings_path = Path(args.mcp_settings).expanduser().resolve()
@@ -958,16 +3284,39 @@ def main() -> None:
 
     settings_data = prepare_mcp_settings(settings_path, os.environ)
     overrides = load_mcp_descriptions(base_dir)
+    result_cache_path = Path(args.result_cache_path).expanduser() if args.result_cache_path else None
+    result_cache = ResultCache(args.result_cache_max_bytes, result_cache_path)
+    metrics = Metrics()
+    if args.trace_path:
+        set_tracer(Tracer(Path(args.trace_path).expanduser(), args.trace_format))
+    if args.metrics_port is not None:
+        serve_metrics(metrics, args.metrics_port)
     sync = BridgeSync(
         mcp_settings_data=settings_data,
         force_refresh=args.force_refresh,
         output_dir=None,
         log_level="INFO",
         description_overrides=overrides,
+        tools_cache_ttl=args.tools_cache_ttl,
+        result_cache=result_cache,
+        residency_limits=ResidencyLimits(
+            idle_timeout_seconds=args.idle_timeout,
+            max_resident_servers=args.max_resident_servers,
+            max_resident_rss_bytes=args.max_resident_memory_mb * 1024 * 1024,
+        ),
+        metrics=metrics,
     )
     sync.start()
 
-    mcp = FastMCP("dev-swarm-mcp")
+    @asynccontextmanager
+    async def lifespan(_server: FastMCP) -> AsyncIterator[None]:
+        try:
+            yield
+        finally:
+            await sync.aclose()
+            result_cache.close()
+
+    mcp = FastMCP("dev-swarm-mcp", lifespan=lifespan)
 
     @mcp.tool()
     def get_message_for_user() -> str:
@@ -975,13 +3324,22 @@ def main() -> None:
         return sync.get_message()
 
     @mcp.tool()
-    def request(json_str: str) -> str:
-        """Forward a JSON request payload from a agent skill to mcp tool. the payload must include server_id. Use the best agent skill with server_id instead of calling mcp tool directly."""
+    async def request(json_str: str, ctx: Context) -> str:
+        """Forward a JSON request payload from a agent skill to mcp tool. the payload must include server_id. Use the best agent skill with server_id instead of calling mcp tool directly. To send several requests at once, pass a JSON array of payloads; they run concurrently and the response has a "results" array in the same order, each item with its own status."""
         try:
-            bridge = sync.wait_ready()
+            bridge = sync.get_bridge()
         except Exception as exc:
-            return json.dumps({"status": "error", "detail": str(exc)}, ensure_ascii=True)
-        return bridge.handle_request_json(json_str)
+            return _error_json(str(exc))
+        token = PROGRESS_HANDLER.set(progress_forwarder(ctx))
+        try:
+            return await bridge.handle_request_json_async(json_str)
+        finally:
+            PROGRESS_HANDLER.reset(token)
+
+    @mcp.tool(name="metrics")
+    def get_metrics() -> str:
+        """Return bridge metrics (per-server and per-tool call counts, errors, timeouts, latency histograms, in-flight calls and restarts) in the Prometheus text format."""
+        return metrics.render()
 
     mcp.run()
 
@@ -1,15 +1,25 @@
 #!/usr/bin/env python3
 import argparse
 import asyncio
+import importlib
+import io
 import json
+import os
+import struct
 import sys
 import threading
 import signal
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from dataclasses import dataclass, replace
+from multiprocessing import resource_tracker, shared_memory
 
 import mss
 from mss import tools
 import numpy as np
+from PIL import Image
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.responses import HTMLResponse, Response
 import uvicorn
@@ -69,11 +79,42 @@ parser.add_argument(
     default=15,
     help="Target frames per second (default: 15).",
 )
+parser.add_argument(
+    "--min-fps",
+    type=float,
+    default=2.0,
+    help="Capture rate while the screen is unchanged, and the lowest rate a congested client is slowed to (default: 2).",
+)
+parser.add_argument(
+    "--max-downscale",
+    type=int,
+    choices=[1, 2, 4],
+    default=4,
+    help="Largest factor frames are downscaled by for a congested client; 1 disables downscaling (default: 4).",
+)
 parser.add_argument(
     "--background",
     action="store_true",
     help="Capture continuously in the background so /snapshot.png works without a client.",
 )
+parser.add_argument(
+    "--keyframe-interval",
+    type=float,
+    default=10.0,
+    help="Seconds between full frames on /ws; other frames only carry changed tiles (default: 10).",
+)
+parser.add_argument(
+    "--ring-size",
+    type=int,
+    default=4,
+    help="Number of recent frames kept by background capture (default: 4).",
+)
+parser.add_argument(
+    "--shm-name",
+    type=str,
+    default=None,
+    help="Export background frames as POSIX shared memory with this name (e.g. dev-swarm-screen).",
+)
 
 args = parser.parse_args()
 
@@ -83,16 +124,28 @@ REL_LEFT = args.left
 REQ_WIDTH = args.width
 REQ_HEIGHT = args.height
 TARGET_FPS = max(1, args.fps)
+MIN_FPS = min(TARGET_FPS, max(0.5, args.min_fps))
+MAX_DOWNSCALE = args.max_downscale
+# Capture drops to MIN_FPS once the screen has been unchanged this long.
+IDLE_AFTER = 2.0
 BACKGROUND_CAPTURE = args.background
+RING_SIZE = max(2, args.ring_size)
+KEYFRAME_INTERVAL = max(0.5, args.keyframe_interval)
+TILE_SIZE = 64
+# Send a keyframe instead of tiles once this share of the tiles changed.
+MAX_DELTA_FRACTION = 0.5
+SHM_NAME = args.shm_name
 USE_OVERLAY = MONITOR_ID == -1
 
 print(
     f"[config] monitor={MONITOR_ID}, top={REL_TOP}, left={REL_LEFT}, "
-    f"width={REQ_WIDTH}, height={REQ_HEIGHT}, fps={TARGET_FPS}, "
+    f"width={REQ_WIDTH}, height={REQ_HEIGHT}, fps={TARGET_FPS} (min {MIN_FPS:g}), "
     f"host={args.host}, port={args.port}"
 )
 if BACKGROUND_CAPTURE:
-    print("[config] background capture enabled")
+    print(f"[config] background capture enabled, ring of {RING_SIZE} frames")
+    if SHM_NAME:
+        print(f"[config] frames exported as shared memory '{SHM_NAME}'")
 
 if USE_OVERLAY:
     print("[config] monitor=-1 uses a transparent overlay window")
@@ -102,10 +155,8 @@ if USE_OVERLAY:
 
 app = FastAPI()
 frame_lock = threading.Lock()
-latest_rgba = None
-latest_png = None
-latest_size = (0, 0)
-last_capture_ts = 0.0
+frame_ring = None  # FrameRing, created by capture_background
+png_cache = (0, None)  # (frame seq, PNG bytes) of the last /snapshot.png
 
 overlay_lock = threading.Lock()
 overlay_region = None
@@ -300,9 +351,19 @@ async def index():
     let frameWidth = 0;
     let frameHeight = 0;
     let initialized = false;
+    let hasKeyframe = false;
+    let encoding = "raw";
+    let pending = Promise.resolve();
 
+    const KEYFRAME = 0;
+    const DELTA = 1;
+    const FRAME_HEADER_BYTES = 8;
+    const RECT_HEADER_BYTES = 8;
+    const IMAGE_TYPES = { jpeg: "image/jpeg", webp: "image/webp" };
+
+    // Options such as ?encoding=jpeg&quality=60 on this page are passed on to /ws.
     const wsProtocol = (location.protocol === "https:") ? "wss" : "ws";
-    const wsUrl = wsProtocol + "://" + location.host + "/ws";
+    const wsUrl = wsProtocol + "://" + location.host + "/ws" + location.search;
     const ws = new WebSocket(wsUrl);
     ws.binaryType = "arraybuffer";
 
@@ -318,54 +379,127 @@ async def index():
         console.error("WebSocket error:", e);
     };
 
-    ws.onmessage = (event) => {
-        if (typeof event.data === "string") {
-            try {
-                const msg = JSON.parse(event.data);
-                if (msg.type === "init") {
-                    frameWidth = msg.width;
-                    frameHeight = msg.height;
-                    console.log(`Streaming ${frameWidth}x${frameHeight}`);
-                    initialized = true;
-                    resizeCanvasToDisplaySize();
-                } else if (msg.type === "error") {
-                    console.error("Server error:", msg.message);
-                }
-            } catch (err) {
-                console.error("Failed to parse JSON message:", err);
-            }
-            return;
-        }
-
-        if (!initialized) return;
+    async function inflate(bytes) {
+        const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("deflate"));
+        return new Uint8Array(await new Response(stream).arrayBuffer());
+    }
 
-        const buffer = event.data;
-        const pixels = new Uint8Array(buffer);
+    function decodeImage(bytes) {
+        return createImageBitmap(new Blob([bytes], { type: IMAGE_TYPES[encoding] }));
+    }
 
-        if (pixels.length !== frameWidth * frameHeight * 4) {
-            console.warn("Unexpected pixel data length:", pixels.length);
+    // Binary frames: u8 kind, u8 pad, u16 rect count, u32 seq, then the frame body for
+    // the negotiated encoding (see ENCODINGS in screen_stream.py).
+    async function applyFrame(buffer) {
+        const header = new DataView(buffer);
+        const kind = header.getUint8(0);
+        const rectCount = header.getUint16(2, true);
+        const isImage = encoding in IMAGE_TYPES;
+
+        let body = new Uint8Array(buffer, FRAME_HEADER_BYTES);
+        if (encoding === "deflate") {
+            body = await inflate(body);
+        }
+        const view = new DataView(body.buffer, body.byteOffset, body.byteLength);
+
+        if (kind === KEYFRAME) {
+            if (isImage) {
+                const bitmap = await decodeImage(body);
+                gl.bindTexture(gl.TEXTURE_2D, texture);
+                gl.texImage2D(gl.TEXTURE_2D, 0, gl.RGBA, gl.RGBA, gl.UNSIGNED_BYTE, bitmap);
+                bitmap.close();
+            } else {
+                if (body.length !== frameWidth * frameHeight * 4) {
+                    console.warn("Unexpected pixel data length:", body.length);
+                    return;
+                }
+                gl.bindTexture(gl.TEXTURE_2D, texture);
+                gl.pixelStorei(gl.UNPACK_ALIGNMENT, 1);
+                gl.texImage2D(
+                    gl.TEXTURE_2D,
+                    0,
+                    gl.RGBA,
+                    frameWidth,
+                    frameHeight,
+                    0,
+                    gl.RGBA,
+                    gl.UNSIGNED_BYTE,
+                    body
+                );
+            }
+            hasKeyframe = true;
+        } else if (kind === DELTA && hasKeyframe) {
+            const rects = [];
+            let offset = 0;
+            for (let i = 0; i < rectCount; i++) {
+                const x = view.getUint16(offset, true);
+                const y = view.getUint16(offset + 2, true);
+                const w = view.getUint16(offset + 4, true);
+                const h = view.getUint16(offset + 6, true);
+                offset += RECT_HEADER_BYTES;
+                const length = isImage ? view.getUint32(offset, true) : w * h * 4;
+                if (isImage) offset += 4;
+                const bytes = body.subarray(offset, offset + length);
+                offset += length;
+                rects.push({ x, y, w, h, pixels: isImage ? decodeImage(bytes) : bytes });
+            }
+            gl.bindTexture(gl.TEXTURE_2D, texture);
+            gl.pixelStorei(gl.UNPACK_ALIGNMENT, 1);
+            for (const rect of rects) {
+                if (isImage) {
+                    const bitmap = await rect.pixels;
+                    gl.texSubImage2D(gl.TEXTURE_2D, 0, rect.x, rect.y, gl.RGBA, gl.UNSIGNED_BYTE, bitmap);
+                    bitmap.close();
+                } else {
+                    gl.texSubImage2D(gl.TEXTURE_2D, 0, rect.x, rect.y, rect.w, rect.h, gl.RGBA, gl.UNSIGNED_BYTE, rect.pixels);
+                }
+            }
+        } else {
             return;
         }
 
-        gl.bindTexture(gl.TEXTURE_2D, texture);
-        gl.pixelStorei(gl.UNPACK_ALIGNMENT, 1);
-        gl.texImage2D(
-            gl.TEXTURE_2D,
-            0,
-            gl.RGBA,
-            frameWidth,
-            frameHeight,
-            0,
-            gl.RGBA,
-            gl.UNSIGNED_BYTE,
-            pixels
-        );
-
         resizeCanvasToDisplaySize();
         gl.viewport(0, 0, canvas.width, canvas.height);
         gl.clearColor(0.0, 0.0, 0.0, 1.0);
         gl.clear(gl.COLOR_BUFFER_BIT);
         gl.drawArrays(gl.TRIANGLE_STRIP, 0, 4);
+    }
+
+    function handleText(data) {
+        try {
+            const msg = JSON.parse(data);
+            if (msg.type === "init") {
+                frameWidth = msg.width;
+                frameHeight = msg.height;
+                encoding = msg.encoding || "raw";
+                console.log(`Streaming ${frameWidth}x${frameHeight} (${encoding})`);
+                initialized = true;
+                hasKeyframe = false;
+                resizeCanvasToDisplaySize();
+            } else if (msg.type === "error") {
+                console.error("Server error:", msg.message);
+            }
+        } catch (err) {
+            console.error("Failed to parse JSON message:", err);
+        }
+    }
+
+    // Decoding can be asynchronous (inflate, images), so messages are applied in order
+    // through one promise chain; a delta must never land before the frame it builds on.
+    ws.onmessage = (event) => {
+        const data = event.data;
+        pending = pending.then(async () => {
+            if (typeof data === "string") {
+                handleText(data);
+                return;
+            }
+            try {
+                if (initialized) await applyFrame(data);
+            } finally {
+                // Acks let the server slow down or downscale when this viewer falls behind.
+                ws.send(JSON.stringify({ type: "ack", seq: new DataView(data).getUint32(4, true) }));
+            }
+        }).catch((err) => console.error("Failed to apply frame:", err));
     };
 
     resizeCanvasToDisplaySize();
@@ -380,124 +514,26 @@ async def index():
 @app.websocket("/ws")
 async def websocket_endpoint(ws: WebSocket):
     """
-    Each WebSocket connection gets its own capture loop.
-    - Capture only starts after the WebSocket is accepted.
-    - Loop stops cleanly when the client disconnects or refreshes.
+    Streams frames from the shared capture producer (see FrameHub) to one viewer.
+    - Capture only runs while at least one viewer is connected (or with --background).
+    - A viewer that falls behind skips to the newest frame, then gets a lower frame rate
+      and resolution until it catches up; others are not slowed down.
     """
     await ws.accept()
-    print("[ws] client connected")
-
     try:
-        if BACKGROUND_CAPTURE:
-            last_size = (0, 0)
-            while True:
-                if shutdown_flag.is_set() or (uvicorn_server is not None and uvicorn_server.should_exit):
-                    request_shutdown("server exit signaled")
-                    await ws.close(code=1001, reason="server shutdown")
-                    break
-
-                with frame_lock:
-                    rgba = latest_rgba
-                    width, height = latest_size
-
-                if rgba is None or width == 0 or height == 0:
-                    await asyncio.sleep(0.05)
-                    continue
-
-                if (width, height) != last_size:
-                    init_msg = {
-                        "type": "init",
-                        "width": width,
-                        "height": height,
-                    }
-                    await ws.send_text(json.dumps(init_msg))
-                    last_size = (width, height)
-                if last_size != (0, 0):
-                    break
-
-            frame_interval = 1.0 / TARGET_FPS
-            while True:
-                if shutdown_flag.is_set() or (uvicorn_server is not None and uvicorn_server.should_exit):
-                    request_shutdown("server exit signaled")
-                    await ws.close(code=1001, reason="server shutdown")
-                    break
-
-                start = asyncio.get_event_loop().time()
-                with frame_lock:
-                    rgba = latest_rgba
-                    width, height = latest_size
-                if (width, height) != last_size and width > 0 and height > 0:
-                    init_msg = {
-                        "type": "init",
-                        "width": width,
-                        "height": height,
-                    }
-                    await ws.send_text(json.dumps(init_msg))
-                    last_size = (width, height)
-                if last_size == (0, 0):
-                    await asyncio.sleep(0.05)
-                    continue
-                if rgba is not None:
-                    await ws.send_bytes(rgba)
-
-                elapsed = asyncio.get_event_loop().time() - start
-                sleep_time = frame_interval - elapsed
-                if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
-        else:
-            with mss.mss() as sct:
-                monitor_region = get_capture_region(sct)
-                print(f"[capture] Using region: {monitor_region} (monitor index {MONITOR_ID})")
-
-                # First frame for size
-                first_frame = sct.grab(monitor_region)
-                h = first_frame.height
-                w = first_frame.width
-
-                init_msg = {
-                    "type": "init",
-                    "width": w,
-                    "height": h,
-                }
-                await ws.send_text(json.dumps(init_msg))
-
-                frame_interval = 1.0 / TARGET_FPS
-
-                # ---- CAPTURE LOOP: ONLY WHILE THIS CLIENT IS CONNECTED ----
-                while True:
-                    if shutdown_flag.is_set() or (uvicorn_server is not None and uvicorn_server.should_exit):
-                        request_shutdown("server exit signaled")
-                        await ws.close(code=1001, reason="server shutdown")
-                        break
-
-                    start = asyncio.get_event_loop().time()
-
-                    if USE_OVERLAY:
-                        try:
-                            new_region = get_capture_region(sct)
-                        except ValueError:
-                            await asyncio.sleep(0.05)
-                            continue
-                        if new_region != monitor_region:
-                            monitor_region = new_region
-                            init_msg = {
-                                "type": "init",
-                                "width": monitor_region["width"],
-                                "height": monitor_region["height"],
-                            }
-                            await ws.send_text(json.dumps(init_msg))
-
-                    frame = sct.grab(monitor_region)
-                    img = np.asarray(frame)        # BGRA
-                    rgba = img[..., [2, 1, 0, 3]]  # to RGBA
-
-                    await ws.send_bytes(rgba.tobytes())
-
-                    elapsed = asyncio.get_event_loop().time() - start
-                    sleep_time = frame_interval - elapsed
-                    if sleep_time > 0:
-                        await asyncio.sleep(sleep_time)
-
+        codec = parse_codec(ws.query_params)
+    except ValueError as e:
+        await ws.send_text(json.dumps({"type": "error", "message": str(e)}))
+        await ws.close(code=1008)
+        return
+    print(f"[ws] client connected, encoding={codec.name}")
+    viewer = hub.subscribe(codec)
+    sender = asyncio.create_task(stream_to_client(ws, viewer))
+    receiver = asyncio.create_task(receive_from_client(ws, viewer))
+    try:
+        done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
     except WebSocketDisconnect:
         print("[ws] client disconnected")
     except Exception as e:
@@ -511,6 +547,51 @@ async def websocket_endpoint(ws: WebSocket):
             await ws.close()
         except Exception:
             pass
+    finally:
+        hub.unsubscribe(viewer)
+        for task in (sender, receiver):
+            task.cancel()
+
+
+async def receive_from_client(ws: WebSocket, viewer: "Viewer"):
+    """Reads frame acks for rate control; also notices a closed tab without waiting for a send."""
+    while True:
+        message = await ws.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+        if not message.get("text"):
+            continue
+        try:
+            msg = json.loads(message["text"])
+        except ValueError:
+            continue
+        if isinstance(msg, dict) and msg.get("type") == "ack" and isinstance(msg.get("seq"), int):
+            viewer.ack(msg["seq"])
+
+
+async def stream_to_client(ws: WebSocket, viewer: "Viewer"):
+    last_size = None
+    while True:
+        item = await viewer.next()
+        if item is None:
+            if hub.error is not None:
+                raise hub.error
+            request_shutdown("server exit signaled")
+            await ws.close(code=1001, reason="server shutdown")
+            return
+        if (item.width, item.height) != last_size:
+            init_msg = {
+                "type": "init",
+                "width": item.width,
+                "height": item.height,
+                "encoding": viewer.codec.name,
+                "quality": viewer.codec.quality,
+            }
+            await ws.send_text(json.dumps(init_msg))
+            last_size = (item.width, item.height)
+        started = time.monotonic()
+        await ws.send_bytes(item.payload)
+        viewer.sent(item.seq, time.monotonic() - started)
 
 
 shutdown_flag = threading.Event()
@@ -549,41 +630,679 @@ def get_capture_region(sct: mss.mss) -> dict:
     }
 
 
-def capture_background():
-    global latest_rgba, latest_png, latest_size, last_capture_ts
-    frame_interval = 1.0 / TARGET_FPS
+# ---------- FRAME RING ----------
+#
+# Background capture writes frames into a fixed ring of preallocated RGBA slots. With
+# --shm-name the ring lives in POSIX shared memory so local processes (use_computer.py)
+# can read frames without HTTP. Shared memory layout, little-endian:
+#   header:  magic, slot count, max width, max height, latest sequence number, owner pid,
+#            generation
+#   slot i:  at HEADER_BYTES + i * slot stride; a slot header followed by RGBA rows
+# A slot's sequence number is 0 while it is being written (readers retry). When the ring
+# is reallocated for a larger capture area, the old segment's generation is set to 0 and
+# a new segment with the next generation takes over the name; readers that see 0 re-attach.
+
+SHM_MAGIC = b"DSFRAME1"
+SHM_HEADER = struct.Struct("<8sIIIQII")
+SHM_SLOT_HEADER = struct.Struct("<QIIiid")  # seq, width, height, left, top, capture time
+SHM_ALIGN = 64
+
+
+def _align(size: int) -> int:
+    return (size + SHM_ALIGN - 1) // SHM_ALIGN * SHM_ALIGN
+
+
+@dataclass(frozen=True)
+class Frame:
+    seq: int
+    width: int
+    height: int
+    left: int
+    top: int
+    timestamp: float
+    rgba: np.ndarray  # (height, width, 4) view into the ring slot, valid while the slot is not reused
+
+
+class FrameRing:
+    """Preallocated ring of RGBA frames with increasing sequence numbers.
+
+    The writer fills the slot after the latest one, so a frame read from the ring stays
+    intact for ``slots - 1`` further captures; copy it if you need it longer.
+    """
+
+    def __init__(
+        self, slots: int, max_width: int, max_height: int, shm_name: str | None = None, generation: int = 1
+    ):
+        self.slots = slots
+        self.max_width = max_width
+        self.max_height = max_height
+        self.generation = generation
+        self._header_bytes = _align(SHM_HEADER.size)
+        self._slot_data_offset = _align(SHM_SLOT_HEADER.size)
+        self._slot_stride = _align(self._slot_data_offset + max_width * max_height * 4)
+        size = self._header_bytes + slots * self._slot_stride
+        self._shm = None
+        if shm_name:
+            self._shm = _create_shared_memory(shm_name, size)
+            buf = self._shm.buf
+        else:
+            buf = memoryview(bytearray(size))
+        self._buf = buf
+        self._array = np.frombuffer(buf, dtype=np.uint8, count=size)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._frames = [None] * slots
+        self._write_header(generation)
+
+    def _write_header(self, generation: int):
+        SHM_HEADER.pack_into(
+            self._buf, 0, SHM_MAGIC, self.slots, self.max_width, self.max_height, self._seq,
+            os.getpid(), generation,
+        )
+
+    def fits(self, width: int, height: int) -> bool:
+        return width <= self.max_width and height <= self.max_height
+
+    def _slot_offset(self, seq: int) -> int:
+        return self._header_bytes + (seq % self.slots) * self._slot_stride
+
+    def begin(self, width: int, height: int):
+        """Claim the slot for the next frame; returns (seq, writable (height, width, 4) view)."""
+        seq = self._seq + 1
+        offset = self._slot_offset(seq)
+        SHM_SLOT_HEADER.pack_into(self._buf, offset, 0, width, height, 0, 0, 0.0)
+        start = offset + self._slot_data_offset
+        pixels = self._array[start:start + width * height * 4].reshape(height, width, 4)
+        return seq, pixels
+
+    def commit(self, seq: int, pixels: np.ndarray, left: int, top: int, timestamp: float) -> Frame:
+        height, width = pixels.shape[:2]
+        offset = self._slot_offset(seq)
+        SHM_SLOT_HEADER.pack_into(self._buf, offset, seq, width, height, left, top, timestamp)
+        frame = Frame(seq, width, height, left, top, timestamp, pixels)
+        with self._lock:
+            self._frames[seq % self.slots] = frame
+            self._seq = seq
+        self._write_header(self.generation)
+        return frame
+
+    def latest(self):
+        with self._lock:
+            return self._frames[self._seq % self.slots] if self._seq else None
+
+    def close(self):
+        if self._shm is None:
+            return
+        self._write_header(0)  # tell attached readers to re-attach by name
+        self._frames = [None] * self.slots
+        self._array = None
+        self._buf = None
+        shm, self._shm = self._shm, None
+        try:
+            shm.close()
+        except BufferError:
+            pass  # a consumer still holds a view; the OS frees it on exit
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _create_shared_memory(name: str, size: int) -> shared_memory.SharedMemory:
     try:
-        with mss.mss() as sct:
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+    except FileExistsError:
+        pass
+    # Only reclaim a segment left over by a screen_stream that did not shut down cleanly;
+    # unlinking one a live instance still writes would strand that instance's readers.
+    existing = _attach_shared_memory(name)
+    try:
+        owner = None
+        if existing.size >= SHM_HEADER.size:
+            magic, _, _, _, _, owner_pid, _ = SHM_HEADER.unpack_from(existing.buf, 0)
+            if magic == SHM_MAGIC:
+                owner = owner_pid
+    finally:
+        existing.close()
+    if owner is None:
+        raise RuntimeError(
+            f"Shared memory '{name}' exists and is not a screen_stream frame ring; "
+            f"pick another --shm-name"
+        )
+    if _process_alive(owner):
+        raise RuntimeError(
+            f"Shared memory '{name}' is in use by another screen_stream (pid {owner}); "
+            f"stop it or pick another --shm-name"
+        )
+    print(f"[shm] Reclaiming '{name}' left behind by exited pid {owner}")
+    stale = shared_memory.SharedMemory(name=name)
+    stale.close()
+    stale.unlink()
+    return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    # Before 3.13 attaching registers the segment with the resource tracker, which would
+    # unlink it (under its owner's feet) when this process exits.
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _process_alive(pid: int) -> bool:
+    if pid <= 0 or sys.platform == "win32":
+        # Unknown owner, or Windows, where os.kill() cannot probe and named segments
+        # vanish with their last handle anyway: assume it is still around.
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+def bgra_to_rgba(bgra: np.ndarray, out: np.ndarray):
+    """Swap mss' BGRA into an RGBA buffer in place, without temporaries."""
+    np.copyto(out[..., :3], bgra[..., 2::-1])
+    np.copyto(out[..., 3], bgra[..., 3])
+
+
+def ring_for(width: int, height: int, capacity) -> FrameRing:
+    """The current frame ring, reallocated if a frame no longer fits (overlay grown past it)."""
+    global frame_ring
+    if frame_ring is not None and frame_ring.fits(width, height):
+        return frame_ring
+    max_width, max_height = max(width, capacity[0]), max(height, capacity[1])
+    old = frame_ring
+    if old is not None:
+        old.close()  # frees the shared memory name for the new ring
+    generation = old.generation + 1 if old is not None else 1
+    frame_ring = FrameRing(RING_SIZE, max_width, max_height, SHM_NAME, generation)
+    return frame_ring
+
+
+def latest_frame():
+    ring = frame_ring
+    return ring.latest() if ring is not None else None
+
+
+def capture_frames(stop: threading.Event):
+    """
+    Grab frames into the frame ring until `stop` or shutdown.
+    - Runs at hub.capture_fps: TARGET_FPS, or less when every viewer has been slowed down.
+    - Falls back to MIN_FPS while the screen is unchanged and speeds up on the next change.
+    """
+    last_change = time.time()
+    with mss.mss() as sct:
+        if USE_OVERLAY:
+            while not overlay_ready.wait(0.2):
+                if stop.is_set() or shutdown_flag.is_set():
+                    return
+        monitor_region = get_capture_region(sct)
+        print(f"[capture] Using region: {monitor_region} (monitor index {MONITOR_ID})")
+        # The overlay can be resized up to the whole desktop; size the ring for that once.
+        desktop = sct.monitors[0]
+        if USE_OVERLAY:
+            capacity = (desktop["width"], desktop["height"])
+        else:
+            capacity = (monitor_region["width"], monitor_region["height"])
+        while not shutdown_flag.is_set() and not stop.is_set():
+            start = time.time()
             if USE_OVERLAY:
-                overlay_ready.wait()
-            monitor_region = get_capture_region(sct)
-            print(f"[capture] Background region: {monitor_region} (monitor index {MONITOR_ID})")
-            while not shutdown_flag.is_set():
-                start = time.time()
-                if USE_OVERLAY:
-                    try:
-                        monitor_region = get_capture_region(sct)
-                    except ValueError:
-                        time.sleep(0.05)
-                        continue
-                frame = sct.grab(monitor_region)
-                img = np.asarray(frame)        # BGRA
-                rgba = img[..., [2, 1, 0, 3]]  # to RGBA
-                png_bytes = tools.to_png(frame.rgb, frame.size)
-
-                with frame_lock:
-                    latest_rgba = rgba.tobytes()
-                    latest_png = png_bytes
-                    latest_size = frame.size
-                    last_capture_ts = start
-
-                elapsed = time.time() - start
-                sleep_time = frame_interval - elapsed
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
+                try:
+                    monitor_region = get_capture_region(sct)
+                except ValueError:
+                    time.sleep(0.05)
+                    continue
+            frame = sct.grab(monitor_region)
+            width, height = frame.size
+            ring = ring_for(width, height, capacity)
+            previous = ring.latest()
+            seq, pixels = ring.begin(width, height)
+            bgra_to_rgba(np.asarray(frame), pixels)
+            if (
+                previous is None
+                or previous.rgba.shape != pixels.shape
+                or not np.array_equal(previous.rgba.view(np.uint32), pixels.view(np.uint32))
+            ):
+                last_change = start
+            ring.commit(seq, pixels, frame.left, frame.top, start)
+            hub.notify()
+
+            fps = MIN_FPS if start - last_change >= IDLE_AFTER else hub.capture_fps
+            elapsed = time.time() - start
+            sleep_time = 1.0 / fps - elapsed
+            if sleep_time > 0:
+                stop.wait(sleep_time)  # idle waits can be long; stop promptly
+
+
+def capture_background():
+    try:
+        capture_frames(threading.Event())
     except Exception as exc:
         print(f"[capture] background capture stopped: {exc}")
         shutdown_flag.set()
+        hub.notify()
+
+
+# ---------- DELTA ENCODING ----------
+#
+# Binary /ws messages start with FRAME_HEADER (kind, rect count, frame seq). A keyframe
+# carries the whole RGBA frame; a delta carries only the rectangles of tiles that changed
+# since the frame the viewer is showing, each as RECT_HEADER (x, y, width, height) plus
+# its RGBA rows. The browser acks each applied frame with {"type": "ack", "seq": ...}.
+
+KEYFRAME = 0
+DELTA = 1
+FRAME_HEADER = struct.Struct("<BxHI")
+RECT_HEADER = struct.Struct("<HHHH")
+
+
+def changed_tiles(prev: np.ndarray, cur: np.ndarray, tile: int = TILE_SIZE) -> np.ndarray:
+    """Boolean (tile rows, tile cols) grid of tiles whose pixels differ between two frames."""
+    height, width = cur.shape[:2]
+    # Compare whole RGBA pixels as uint32 instead of four bytes each.
+    diff = prev.view(np.uint32)[..., 0] != cur.view(np.uint32)[..., 0]
+    rows, cols = -(-height // tile), -(-width // tile)
+    padded = np.zeros((rows * tile, cols * tile), dtype=bool)
+    padded[:height, :width] = diff
+    return padded.reshape(rows, tile, cols, tile).any(axis=(1, 3))
+
+
+def dirty_rects(tiles: np.ndarray, width: int, height: int, tile: int = TILE_SIZE):
+    """Merge horizontal runs of changed tiles into (x, y, w, h) pixel rectangles."""
+    edges = np.diff(np.pad(tiles.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+    starts = np.argwhere(edges == 1)  # row-major, so starts and ends pair up in order
+    ends = np.argwhere(edges == -1)
+    rects = []
+    for (row, col_start), (_, col_end) in zip(starts, ends):
+        x, y = int(col_start) * tile, int(row) * tile
+        rects.append((x, y, min(int(col_end) * tile, width) - x, min(tile, height - y)))
+    return rects
+
+
+def frame_delta(prev: Frame, frame: Frame):
+    """Rectangles that changed from `prev` to `frame`: [] if none did, None if a keyframe is cheaper."""
+    if (prev.width, prev.height) != (frame.width, frame.height):
+        return None
+    tiles = changed_tiles(prev.rgba, frame.rgba)
+    if not tiles.any():
+        return []
+    if tiles.mean() > MAX_DELTA_FRACTION:
+        return None
+    return dirty_rects(tiles, frame.width, frame.height)
+
+
+# ---------- ENCODINGS ----------
+#
+# Each /ws client picks how pixel data is packed with ?encoding=...&quality=...:
+# - raw: RGBA bytes as described above.
+# - deflate, zstd, lz4: the same bytes after FRAME_HEADER, compressed as one block.
+#   Browsers can only inflate deflate (DecompressionStream); zstd and lz4 are meant for
+#   scripted clients and need the optional zstandard / lz4 packages on the server.
+# - jpeg, webp: lossy. A keyframe is one image; a delta rect is RECT_HEADER, a u32
+#   byte length, then the image of that rect.
+# Messages are encoded on ENCODE_POOL once per frame, kind and codec, and the bytes are
+# shared by every client using the same codec.
+
+LENGTH = struct.Struct("<I")
+IMAGE_FORMATS = {"jpeg": "JPEG", "webp": "WEBP"}
+DEFAULT_QUALITY = 75
+ENCODE_POOL = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="encode")
+
+
+def optional_module(name: str):
+    """Import an optional compressor, or return None when it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+zstandard = optional_module("zstandard")
+lz4_frame = optional_module("lz4.frame")
+
+ENCODINGS = ["raw", "deflate", "jpeg", "webp"]
+if zstandard is not None:
+    ENCODINGS.append("zstd")
+if lz4_frame is not None:
+    ENCODINGS.append("lz4")
+
+
+@dataclass(frozen=True)
+class Codec:
+    name: str = "raw"
+    quality: int = DEFAULT_QUALITY  # only used by jpeg and webp
+
+
+def parse_codec(params) -> Codec:
+    name = params.get("encoding", "raw").lower()
+    if name not in ENCODINGS:
+        raise ValueError(f"unsupported encoding '{name}', available: {', '.join(ENCODINGS)}")
+    if name not in IMAGE_FORMATS:
+        return Codec(name)
+    try:
+        quality = int(params.get("quality", DEFAULT_QUALITY))
+    except ValueError:
+        raise ValueError("quality must be an integer between 1 and 100")
+    return Codec(name, min(100, max(1, quality)))
+
+
+def compress(data, codec: Codec) -> bytes:
+    if codec.name == "deflate":
+        return zlib.compress(data, 1)
+    if codec.name == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    if codec.name == "lz4":
+        return lz4_frame.compress(data)
+    return bytes(data)
+
+
+def encode_image(rgba: np.ndarray, codec: Codec) -> bytes:
+    # Screen pixels are opaque, so dropping alpha keeps JPEG valid and WebP smaller.
+    image = Image.fromarray(np.ascontiguousarray(rgba[..., :3]))
+    out = io.BytesIO()
+    image.save(out, IMAGE_FORMATS[codec.name], quality=codec.quality)
+    return out.getvalue()
+
+
+def downscale(rgba: np.ndarray, factor: int) -> np.ndarray:
+    """Box-filter an RGBA image down by `factor`; edge pixels that don't fill a box are dropped."""
+    if factor == 1:
+        return rgba
+    height, width = rgba.shape[0] // factor, rgba.shape[1] // factor
+    boxes = rgba[:height * factor, :width * factor].reshape(height, factor, width, factor, 4)
+    return (boxes.sum(axis=(1, 3), dtype=np.uint32) // (factor * factor)).astype(np.uint8)
+
+
+def encode_message(frame: Frame, rects, codec: Codec, scale: int = 1) -> bytes:
+    """
+    One binary /ws message: a keyframe when `rects` is None, otherwise a delta of `rects`.
+    With `scale` > 1 the pixels (and rect coordinates) are downscaled by that factor.
+    """
+    if rects is None:
+        header = FRAME_HEADER.pack(KEYFRAME, 0, frame.seq)
+        pixels = downscale(frame.rgba, scale)
+        if codec.name in IMAGE_FORMATS:
+            return header + encode_image(pixels, codec)
+        if codec.name == "raw":
+            return b"".join((header, pixels))
+        return header + compress(pixels, codec)
+    parts = []
+    count = 0
+    for x, y, w, h in rects:
+        # Rects start on TILE_SIZE boundaries, so they stay aligned with the downscaled keyframe.
+        region = downscale(frame.rgba[y:y + h, x:x + w], scale)
+        h, w = region.shape[:2]
+        if not w or not h:
+            continue
+        count += 1
+        parts.append(RECT_HEADER.pack(x // scale, y // scale, w, h))
+        if codec.name in IMAGE_FORMATS:
+            image = encode_image(region, codec)
+            parts.append(LENGTH.pack(len(image)))
+            parts.append(image)
+        else:
+            parts.append(region.tobytes())
+    body = b"".join(parts)
+    if codec.name not in IMAGE_FORMATS and codec.name != "raw":
+        body = compress(body, codec)
+    return FRAME_HEADER.pack(DELTA, count, frame.seq) + body
+
+
+# ---------- BROADCAST ----------
+
+# Rate control: a viewer is congested when a send takes more than half its frame
+# interval, a queued frame had to be replaced, or more than MAX_UNACKED frames are
+# waiting for the browser's ack. It is then halved towards MIN_FPS, then downscaled
+# up to MAX_DOWNSCALE; after RECOVER_AFTER calm seconds it steps back the same way.
+ADJUST_PERIOD = 1.0
+RECOVER_AFTER = 3.0
+MAX_UNACKED = 3
+
+
+@dataclass(frozen=True)
+class Broadcast:
+    seq: int
+    width: int
+    height: int
+    scale: int
+    payload: bytes  # built once per frame, codec and scale, shared by every viewer using it
+    frame: Frame  # private copy of the full-size frame; the viewer's next delta builds on it
+
+
+class Viewer:
+    """A /ws client as seen by the hub: its codec and rate, a one-slot queue and the frame it is showing."""
+
+    def __init__(self, codec: Codec):
+        self.codec = codec
+        self.queue = asyncio.Queue(maxsize=1)
+        self.seq = 0  # seq of the last frame taken for sending
+        self.shown_scale = 1  # scale of that frame
+        self.reference = None  # that frame at full size; deltas must build on it
+        self.fps = float(TARGET_FPS)
+        self.scale = 1
+        self.dropped = 0
+        self.send_time = 0.0  # smoothed seconds per ws.send_bytes
+        self.unacked = deque()  # seqs sent but not acknowledged, once the client acks
+        self._acks = False
+        self._last_offer = 0.0
+        self._last_keyframe = 0.0
+        self._adjusted = self._calm_since = time.monotonic()
+
+    async def next(self):
+        item = await self.queue.get()
+        if item is not None:
+            self.seq = item.seq
+            self.shown_scale = item.scale
+            self.reference = item.frame
+        return item
+
+    def due(self, now: float) -> bool:
+        # Some slack so a viewer running at the capture rate doesn't skip frames on jitter.
+        return now - self._last_offer >= 0.8 / self.fps
+
+    def keyframe_due(self, now: float) -> bool:
+        return now - self._last_keyframe >= KEYFRAME_INTERVAL
+
+    def offered(self, now: float, keyframe: bool):
+        self._last_offer = now
+        if keyframe:
+            self._last_keyframe = now
+
+    def sent(self, seq: int, seconds: float):
+        self.send_time = 0.8 * self.send_time + 0.2 * seconds
+        if self._acks:
+            self.unacked.append(seq)
+
+    def ack(self, seq: int):
+        self._acks = True
+        while self.unacked and self.unacked[0] <= seq:
+            self.unacked.popleft()
+
+    def adjust(self, now: float):
+        if now - self._adjusted < ADJUST_PERIOD:
+            return
+        self._adjusted = now
+        congested = (
+            self.dropped > 0
+            or self.send_time > 0.5 / self.fps
+            or len(self.unacked) > MAX_UNACKED
+        )
+        self.dropped = 0
+        rate = (self.fps, self.scale)
+        if congested:
+            self._calm_since = now
+            if self.fps > MIN_FPS:
+                self.fps = max(MIN_FPS, self.fps / 2)
+            elif self.scale < MAX_DOWNSCALE:
+                self.scale *= 2
+        elif now - self._calm_since >= RECOVER_AFTER:
+            self._calm_since = now
+            if self.scale > 1:
+                self.scale //= 2
+            elif self.fps < TARGET_FPS:
+                self.fps = min(float(TARGET_FPS), self.fps * 2)
+        if (self.fps, self.scale) != rate:
+            print(f"[ws] client {'slowed' if congested else 'sped up'} to {self.fps:g} fps at 1/{self.scale} scale")
+
+
+class FrameHub:
+    """
+    Fans one capture producer out to every /ws viewer.
+    - Each viewer has a one-slot queue; when it is still full the old frame is replaced,
+      so a slow viewer drops to the latest frame instead of stalling the others.
+    - Each viewer is paced and scaled on its own (Viewer.adjust); capture runs at the
+      fastest viewer's rate, or TARGET_FPS with --background.
+    - Each viewer keeps a copy of the frame it is showing and gets only the tiles changed
+      since then, however far it is paced behind capture; it gets a keyframe when it just
+      joined, was rescaled or is due a periodic refresh, and nothing while the screen is
+      unchanged.
+    - Without --background, the capture thread runs only while someone is watching.
+    """
+
+    def __init__(self):
+        self.clients = set()
+        self.error = None
+        self.dropped = 0
+        self.capture_fps = float(TARGET_FPS)  # read by the capture thread
+        self._task = None
+        self._loop = None
+        self._new_frame = None
+
+    def subscribe(self, codec: Codec) -> Viewer:
+        viewer = Viewer(codec)
+        self.clients.add(viewer)
+        if self._task is None or self._task.done():
+            self._loop = asyncio.get_running_loop()
+            self._new_frame = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        return viewer
+
+    def unsubscribe(self, viewer: Viewer):
+        self.clients.discard(viewer)
+        if not self.clients and self._new_frame is not None:
+            self._new_frame.set()  # let the producer notice and stop
+
+    def notify(self):
+        """Called from the capture thread after each committed frame."""
+        loop, event = self._loop, self._new_frame
+        if loop is not None and event is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(event.set)
+
+    def _offer(self, viewer: Viewer, item):
+        if viewer.queue.full():
+            viewer.queue.get_nowait()
+            self.dropped += 1
+            viewer.dropped += 1
+        viewer.queue.put_nowait(item)
+
+    def _start_capture(self) -> threading.Event:
+        stop = threading.Event()
+
+        def run():
+            try:
+                capture_frames(stop)
+            except Exception as exc:
+                print(f"[capture] capture stopped: {exc}")
+                self.error = exc
+                self.notify()
+
+        threading.Thread(target=run, daemon=True).start()
+        return stop
+
+    async def _publish(self, frame: Frame):
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        due = []
+        for viewer in list(self.clients):
+            viewer.adjust(now)
+            if viewer.due(now):
+                due.append(viewer)
+        self.capture_fps = max(
+            [viewer.fps for viewer in self.clients] + ([TARGET_FPS] if BACKGROUND_CAPTURE else []),
+            default=TARGET_FPS,
+        )
+        if not due:
+            return
+        # The ring reuses this slot after a few captures; viewers keep the copy as their delta base.
+        frame = replace(frame, rgba=frame.rgba.copy())
+
+        # Read each base once: stream_to_client can take a queued frame at every await below.
+        bases = {viewer: viewer.reference for viewer in due}
+        deltas = {}  # base seq -> changed rects from that frame to this one
+        for base in bases.values():
+            if base is not None and base.seq not in deltas:
+                deltas[base.seq] = loop.run_in_executor(ENCODE_POOL, frame_delta, base, frame)
+
+        # One encode per (codec, scale, base), started together so they run in parallel.
+        encoded = {}
+
+        def encode(codec: Codec, scale: int, base, rects):
+            key = (codec, scale, base.seq if rects is not None else None)
+            if key not in encoded:
+                encoded[key] = loop.run_in_executor(ENCODE_POOL, encode_message, frame, rects, codec, scale)
+            return encoded[key]
+
+        sends = []
+        for viewer, base in bases.items():
+            rects = await deltas[base.seq] if base is not None else None
+            if rects is not None and not rects:
+                continue  # nothing changed since the frame it is showing
+            if viewer.keyframe_due(now) or viewer.shown_scale != viewer.scale:
+                rects = None
+            if rects is None:
+                base = None
+            sends.append((viewer, viewer.scale, base, encode(viewer.codec, viewer.scale, base, rects)))
+        for viewer, scale, base, payload in sends:
+            data = await payload
+            if base is not None and (viewer.reference is not base or viewer.shown_scale != scale):
+                # stream_to_client took a queued frame meanwhile, so the delta no longer applies.
+                base = None
+                data = await encode(viewer.codec, scale, None, None)
+            if viewer in self.clients:
+                viewer.offered(now, base is None)
+                item = Broadcast(frame.seq, frame.width // scale, frame.height // scale, scale, data, frame)
+                self._offer(viewer, item)
+
+    async def _run(self):
+        self.error = None
+        stop = None if BACKGROUND_CAPTURE else self._start_capture()
+        last_seq = 0
+        try:
+            while self.clients:
+                if shutdown_flag.is_set() or (uvicorn_server is not None and uvicorn_server.should_exit):
+                    break
+                if self.error is not None:
+                    break
+                try:
+                    await asyncio.wait_for(self._new_frame.wait(), timeout=0.25)
+                except asyncio.TimeoutError:
+                    continue
+                self._new_frame.clear()
+                frame = latest_frame()
+                if frame is None or frame.seq == last_seq:
+                    continue
+                await self._publish(frame)
+                last_seq = frame.seq
+        except Exception as exc:
+            # Report it to the viewers below instead of letting them take None for a shutdown.
+            print(f"[ws] frame hub stopped: {exc}")
+            self.error = exc
+        finally:
+            if stop is not None:
+                stop.set()
+            self.capture_fps = float(TARGET_FPS)
+            # None tells viewers to stop: check hub.error, otherwise the server is exiting.
+            for viewer in list(self.clients):
+                self._offer(viewer, None)
+
+
+hub = FrameHub()
 
 
 @app.get("/snapshot.png")
@@ -591,11 +1310,19 @@ async def snapshot_png():
     """
     Returns a single PNG frame for preview or download.
     """
+    global png_cache
     if BACKGROUND_CAPTURE:
-        with frame_lock:
-            png_bytes = latest_png
-        if png_bytes is None:
+        frame = latest_frame()
+        if frame is None:
             return Response(content=b"", status_code=503, media_type="text/plain")
+        with frame_lock:
+            seq, png_bytes = png_cache
+        if seq != frame.seq:
+            # Copy out of the ring now; encode off the event loop.
+            rgb = frame.rgba[..., :3].tobytes()
+            png_bytes = await asyncio.to_thread(tools.to_png, rgb, (frame.width, frame.height))
+            with frame_lock:
+                png_cache = (frame.seq, png_bytes)
         return Response(content=png_bytes, media_type="image/png")
 
     try:
@@ -725,4 +1452,6 @@ if __name__ == "__main__":
             uvicorn_server.run()
     finally:
         shutdown_flag.set()
+        if frame_ring is not None:
+            frame_ring.close()
         print("[server] Server stopped")
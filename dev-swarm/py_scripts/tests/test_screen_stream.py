@@ -0,0 +1,179 @@
+"""FrameHub delta/keyframe fan-out, driven without a capture thread or websocket."""
+import asyncio
+import importlib.util
+import os
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+SCRIPTS = Path(__file__).resolve().parents[1]
+
+
+def load_screen_stream():
+    argv = sys.argv
+    sys.argv = ["screen_stream.py"]  # the module parses the CLI on import
+    try:
+        spec = importlib.util.spec_from_file_location("screen_stream", SCRIPTS / "screen_stream.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.argv = argv
+    return module
+
+
+ss = load_screen_stream()
+WIDTH, HEIGHT = 320, 192
+
+
+class Screen:
+    """Commits frames into an in-memory ring, changing one small patch each time."""
+
+    def __init__(self):
+        self.ring = ss.FrameRing(4, WIDTH, HEIGHT)
+        self.rng = np.random.default_rng(0)
+        self.pixels = self.rng.integers(0, 255, (HEIGHT, WIDTH, 4), dtype=np.uint8)
+
+    def capture(self, changed: bool = True) -> ss.Frame:
+        if changed:
+            y, x = self.rng.integers(0, HEIGHT - 16), self.rng.integers(0, WIDTH - 16)
+            self.pixels[y:y + 16, x:x + 16] = self.rng.integers(0, 255, (16, 16, 4), dtype=np.uint8)
+        seq, pixels = self.ring.begin(WIDTH, HEIGHT)
+        pixels[:] = self.pixels
+        return self.ring.commit(seq, pixels, 0, 0, 0.0)
+
+
+class Client:
+    """Applies raw /ws messages the way the browser does and checks the result."""
+
+    def __init__(self, hub: ss.FrameHub):
+        self.viewer = ss.Viewer(ss.Codec("raw"))
+        hub.clients.add(self.viewer)
+        self.texture = None
+        self.kinds = []
+
+    def apply(self, item: ss.Broadcast):
+        payload = item.payload
+        kind, count, seq = ss.FRAME_HEADER.unpack_from(payload, 0)
+        assert seq == item.seq
+        self.kinds.append(kind)
+        if kind == ss.KEYFRAME:
+            self.texture = np.frombuffer(payload, np.uint8, offset=ss.FRAME_HEADER.size)
+            self.texture = self.texture.reshape(item.height, item.width, 4).copy()
+        else:
+            assert self.texture is not None, "delta before any keyframe"
+            assert self.texture.shape[:2] == (item.height, item.width)
+            offset = ss.FRAME_HEADER.size
+            for _ in range(count):
+                x, y, w, h = ss.RECT_HEADER.unpack_from(payload, offset)
+                offset += ss.RECT_HEADER.size
+                rect = np.frombuffer(payload, np.uint8, count=w * h * 4, offset=offset)
+                self.texture[y:y + h, x:x + w] = rect.reshape(h, w, 4)
+                offset += w * h * 4
+        expected = ss.downscale(item.frame.rgba, item.scale)
+        assert np.array_equal(self.texture, expected), f"frame {item.seq} decoded wrong"
+
+    async def take(self):
+        item = await self.viewer.next()
+        self.apply(item)
+        self.viewer.sent(item.seq, 0.0)
+        return item
+
+
+def make_due(*clients: Client):
+    for client in clients:
+        client.viewer._last_offer = 0.0
+
+
+def test_viewer_taking_a_frame_mid_publish_gets_a_keyframe(monkeypatch):
+    async def scenario():
+        hub = ss.FrameHub()
+        screen = Screen()
+        a, b = Client(hub), Client(hub)
+        hub.clients = dict.fromkeys([a.viewer, b.viewer])  # fix the iteration order: a, then b
+
+        await hub._publish(screen.capture())
+        await a.take()
+        await b.take()
+        make_due(a, b)
+        await hub._publish(screen.capture())
+        await a.take()  # b leaves this delta queued
+        make_due(a)
+        await hub._publish(screen.capture())
+        await a.take()
+
+        # Hold the delta computations until b has taken its queued frame, so b's reference
+        # changes to a frame no delta was started for.
+        started, release = threading.Event(), threading.Event()
+        frame_delta = ss.frame_delta
+
+        def gated_delta(prev, frame):
+            started.set()
+            release.wait(5)
+            return frame_delta(prev, frame)
+
+        monkeypatch.setattr(ss, "frame_delta", gated_delta)
+        make_due(a, b)
+        publish = asyncio.create_task(hub._publish(screen.capture()))
+        await asyncio.to_thread(started.wait, 5)
+        stale = await b.take()
+        release.set()
+        await publish
+
+        assert stale.payload[0] == ss.DELTA
+        assert (await a.take()).payload[0] == ss.DELTA
+        assert (await b.take()).payload[0] == ss.KEYFRAME  # its base went stale while encoding
+
+    asyncio.run(scenario())
+
+
+def test_viewers_at_different_ack_rates_decode_every_frame():
+    async def scenario():
+        hub = ss.FrameHub()
+        screen = Screen()
+        fast, slow = Client(hub), Client(hub)
+        done = asyncio.Event()
+
+        async def capture():
+            for i in range(120):
+                await hub._publish(screen.capture(changed=i % 10 < 7))
+                await asyncio.sleep(0.005)
+            done.set()
+
+        async def watch(client: Client, delay: float, ack_every: int):
+            taken = 0
+            while not done.is_set() or not client.viewer.queue.empty():
+                try:
+                    item = await asyncio.wait_for(client.take(), 0.1)
+                except asyncio.TimeoutError:
+                    continue
+                taken += 1
+                if taken % ack_every == 0:
+                    client.viewer.ack(item.seq)
+                await asyncio.sleep(delay)
+
+        await asyncio.gather(capture(), watch(fast, 0, 1), watch(slow, 0.05, 4))
+        for client in (fast, slow):
+            assert client.kinds[0] == ss.KEYFRAME
+            assert ss.DELTA in client.kinds
+
+    asyncio.run(scenario())
+
+
+def test_reallocated_shared_ring_retires_the_old_segment(monkeypatch):
+    monkeypatch.setattr(ss, "SHM_NAME", f"dsm-test-{os.getpid()}")
+    monkeypatch.setattr(ss, "frame_ring", None)
+    first = ss.ring_for(64, 48, (64, 48))
+    reader = ss._attach_shared_memory(ss.SHM_NAME)  # a reader attached before the resize
+    try:
+        second = ss.ring_for(128, 96, (64, 48))
+        try:
+            assert ss.SHM_HEADER.unpack_from(reader.buf, 0)[6] == 0
+            current = ss._attach_shared_memory(ss.SHM_NAME)
+            assert ss.SHM_HEADER.unpack_from(current.buf, 0)[6] == first.generation + 1
+            current.close()
+        finally:
+            second.close()
+    finally:
+        reader.close()
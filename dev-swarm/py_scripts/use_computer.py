@@ -7,7 +7,9 @@ import tempfile
 import uuid
 import time
 import base64
-from typing import Dict, Any, List
+import struct
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Any, List, Tuple
 
 import pyautogui
 import screeninfo
@@ -41,12 +43,74 @@ def get_screen_info() -> Dict[str, Any]:
         "count": len(monitors)
     }
 
+# Layout of the frame ring exported by `screen_stream.py --background --shm-name NAME`;
+# must match the FRAME RING section there.
+SHM_MAGIC = b"DSFRAME1"
+SHM_HEADER = struct.Struct("<8sIIIQII")
+SHM_SLOT_HEADER = struct.Struct("<QIIiid")
+SHM_ALIGN = 64
+
+
+def _align(size: int) -> int:
+    return (size + SHM_ALIGN - 1) // SHM_ALIGN * SHM_ALIGN
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    # Before 3.13 attaching registers the segment with the resource tracker, which would
+    # unlink it (under screen_stream.py's feet) when this process exits.
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def read_shared_frame(shm_name: str) -> Tuple[Image.Image, int, int]:
+    """Latest frame from a screen_stream.py shared-memory ring, as (image, left, top)."""
+    for _ in range(10):
+        try:
+            shm = _attach_shared_memory(shm_name)
+        except FileNotFoundError:
+            raise ValueError(f"No shared memory '{shm_name}'; is screen_stream.py running with --shm-name?")
+        try:
+            frame = _read_latest_frame(shm, shm_name)
+        finally:
+            shm.close()
+        if frame is not None:
+            return frame
+    raise ValueError("Frames changed too quickly to read; try again")
+
+
+def _read_latest_frame(shm: shared_memory.SharedMemory, shm_name: str):
+    """(image, left, top), or None to retry: a slot changed mid-copy or the ring was replaced."""
+    magic, slots, max_width, max_height, _, _, _ = SHM_HEADER.unpack_from(shm.buf, 0)
+    if magic != SHM_MAGIC:
+        raise ValueError(f"Shared memory '{shm_name}' is not a screen_stream frame ring")
+    slot_data_offset = _align(SHM_SLOT_HEADER.size)
+    slot_stride = _align(slot_data_offset + max_width * max_height * 4)
+    for _ in range(10):
+        _, _, _, _, seq, _, generation = SHM_HEADER.unpack_from(shm.buf, 0)
+        if generation == 0:
+            return None  # reallocated under a new segment with the same name; attach again
+        if seq == 0:
+            raise ValueError("screen_stream.py has not captured a frame yet")
+        offset = _align(SHM_HEADER.size) + (seq % slots) * slot_stride
+        slot_seq, width, height, left, top, _ = SHM_SLOT_HEADER.unpack_from(shm.buf, offset)
+        start = offset + slot_data_offset
+        data = bytes(shm.buf[start:start + width * height * 4])
+        # The writer zeroes the slot's seq while refilling it; retry if that happened mid-copy.
+        if slot_seq == seq and SHM_SLOT_HEADER.unpack_from(shm.buf, offset)[0] == seq:
+            return Image.frombytes("RGBA", (width, height), data), left, top
+    return None
+
+
 def get_screenshot(params: Dict[str, Any]) -> Dict[str, Any]:
     bbox = params.get("bbox") # [x, y, width, height]
     scale = params.get("scale", 1.0)
     draw_pointer = params.get("draw_pointer", False)
     pointer_radius = params.get("pointer_radius", 8)
     pointer_style = params.get("pointer_style", "contrast")
+    shm_name = params.get("shm_name")
     
     region = None
     if bbox and len(bbox) == 4:
@@ -54,8 +118,18 @@ def get_screenshot(params: Dict[str, Any]) -> Dict[str, Any]:
     
     try:
         mouse_x, mouse_y = pyautogui.position()
-        # pyautogui.screenshot() returns a PIL Image
-        img = pyautogui.screenshot(region=region)
+        if shm_name:
+            # Read the latest frame published by screen_stream.py instead of capturing again.
+            img, origin_x, origin_y = read_shared_frame(shm_name)
+            if region:
+                crop_left = region[0] - origin_x
+                crop_top = region[1] - origin_y
+                img = img.crop((crop_left, crop_top, crop_left + region[2], crop_top + region[3]))
+                origin_x, origin_y = region[0], region[1]
+        else:
+            # pyautogui.screenshot() returns a PIL Image
+            img = pyautogui.screenshot(region=region)
+            origin_x, origin_y = (region[0], region[1]) if region else (0, 0)
 
         # Save original dimensions before scaling
         original_width = img.width
@@ -75,10 +149,8 @@ def get_screenshot(params: Dict[str, Any]) -> Dict[str, Any]:
                 pointer_fill_color = (0, 0, 0, 128)  # Semi-transparent black (RGBA)
 
             # Calculate pointer position relative to the screenshot region.
-            rel_x, rel_y = mouse_x, mouse_y
-            if region:
-                rel_x = mouse_x - region[0]
-                rel_y = mouse_y - region[1]
+            rel_x = mouse_x - origin_x
+            rel_y = mouse_y - origin_y
 
             # Only draw if the pointer is within the captured region bounds (use original dimensions).
             bounds_width = region[2] if region else original_width